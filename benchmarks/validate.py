@@ -0,0 +1,118 @@
+"""
+Benchmark of :py:meth:`wiring.graph.Graph.validate` on synthetic graphs.
+
+Run with Wiring importable, for example from the repository root::
+
+    PYTHONPATH=. python benchmarks/validate.py --nodes 100000
+"""
+
+from __future__ import print_function
+
+import argparse
+import functools
+import random
+import timeit
+
+from wiring import FactoryProvider, Graph
+
+
+def _factory(*args, **kwargs):
+    pass
+
+
+def _provider(dependencies):
+    provider = FactoryProvider(_factory)
+    provider.dependencies = dict(enumerate(dependencies))
+    return provider
+
+
+def _graph(providers):
+    graph = Graph()
+    graph.register_providers(providers)
+    return graph
+
+
+def chain(nodes):
+    """A single path where each node depends on the previous one."""
+    providers = {0: _provider([])}
+    for node in range(1, nodes):
+        providers[node] = _provider([node - 1])
+    return _graph(providers)
+
+
+def tree(nodes, fanout=8):
+    """A tree where each node depends on its `fanout` children."""
+    providers = {}
+    for node in range(nodes):
+        first_child = node * fanout + 1
+        providers[node] = _provider([
+            child for child in range(first_child, first_child + fanout)
+            if child < nodes
+        ])
+    return _graph(providers)
+
+
+def dag(nodes, edges=4, seed=0):
+    """
+    A random directed acyclic graph where each node depends on up to `edges`
+    nodes with lower numbers.
+    """
+    generator = random.Random(seed)
+    providers = {0: _provider([])}
+    for node in range(1, nodes):
+        providers[node] = _provider(
+            set(generator.randrange(node) for _ in range(edges))
+        )
+    return _graph(providers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--nodes', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+
+    for name, builder in (('chain', chain), ('tree', tree), ('dag', dag)):
+        graph = builder(arguments.nodes)
+        report(
+            name,
+            arguments.nodes,
+            'full',
+            timeit.repeat(
+                functools.partial(graph.validate, full=True),
+                repeat=arguments.repeat,
+                number=1
+            )
+        )
+        middle = arguments.nodes // 2
+        provider = graph.providers[middle]
+
+        def override():
+            # Validate after overriding a single provider, as tests do.
+            graph.register_provider(middle, provider)
+            graph.validate()
+        # The first incremental validation builds reverse dependency index.
+        graph.validate()
+        report(
+            name,
+            arguments.nodes,
+            'override',
+            timeit.repeat(override, repeat=arguments.repeat, number=1)
+        )
+
+
+def report(name, nodes, kind, timings):
+    print(
+        "{name:>6}: {nodes} nodes, {kind:>8}, best {best:.4f}s,"
+        " worst {worst:.4f}s".format(
+            name=name,
+            nodes=nodes,
+            kind=kind,
+            best=min(timings),
+            worst=max(timings)
+        )
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -31,6 +31,7 @@ class InitTest(unittest.TestCase):
         'wiring.configuration',
         'wiring.dependency',
         'wiring.graph',
+        'wiring.handle',
         'wiring.interface',
         'wiring.providers',
         'wiring.scopes',
@@ -7,7 +7,7 @@ from wiring.configuration import (
     scope
 )
 from wiring.dependency import inject
-from wiring.graph import Graph
+from wiring.graph import Graph, UnknownScopeError
 from wiring.providers import (
     FactoryProvider,
     FunctionProvider,
@@ -97,6 +97,77 @@ class ModuleTest(unittest.TestCase):
         self.assertEqual(graph.get('fizz'), 'fizz!')
         self.assertEqual(graph.get(('buzz', 12)), 'buzz12!')
 
+    def test_inheritance(self):
+        class BaseModule(Module):
+            instances = {
+                'foo': 'base',
+                'bar': 'base',
+                'baz': 'base',
+            }
+
+            @provides('fizz')
+            def provide_fizz(self):
+                return 'base'
+
+        class FirstModule(BaseModule):
+            instances = {
+                'foo': 'first',
+            }
+
+        class SecondModule(BaseModule):
+            instances = {
+                'bar': 'second',
+            }
+
+            @provides('fizz')
+            def provide_fizz(self):
+                return 'second'
+
+        class ThirdModule(FirstModule):
+            instances = {
+                'baz': 'third',
+            }
+
+        class DiamondModule(FirstModule, SecondModule):
+            pass
+
+        def get_all(module):
+            graph = Graph()
+            module().add_to(graph)
+            return tuple(
+                graph.get(specification)
+                for specification in ('foo', 'bar', 'baz', 'fizz')
+            )
+
+        self.assertTupleEqual(
+            get_all(ThirdModule),
+            ('first', 'base', 'third', 'base')
+        )
+        foo, _, baz, fizz = get_all(DiamondModule)
+        self.assertTupleEqual((foo, baz, fizz), ('first', 'base', 'second'))
+
+    def test_add_to_atomic(self):
+        class FooBarScope(object):
+            pass
+
+        class SomeModule(Module):
+            instances = {
+                'foo': 12,
+            }
+
+            @provides('bar')
+            @scope(FooBarScope)
+            def provide_bar(self):
+                return 'bar'
+
+        graph = Graph()
+        with self.assertRaises(UnknownScopeError):
+            SomeModule().add_to(graph)
+        self.assertNotIn('foo', graph.providers)
+        graph.register_scope(FooBarScope, ProcessScope())
+        SomeModule().add_to(graph)
+        self.assertEqual(graph.get('bar'), 'bar')
+
     def test_duplicate_validation(self):
         with self.assertRaises(InvalidConfigurationError) as cm:
             class SomeModule(Module):
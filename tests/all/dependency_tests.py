@@ -184,6 +184,59 @@ class GetDependenciesTest(unittest.TestCase):
             }
         )
 
+    def test_cached_copy(self):
+        def function(foo=UnrealizedInjection('foo')):
+            pass
+        dependencies = get_dependencies(function)
+        dependencies['bar'] = 'bar'
+        self.assertDictEqual(
+            get_dependencies(function),
+            {
+                'foo': 'foo',
+            }
+        )
+
+    def test_cached_class_redecorated(self):
+        class Foo(object):
+            def __init__(self, foo=UnrealizedInjection('foo')):
+                pass
+
+        self.assertDictEqual(get_dependencies(Foo), {'foo': 'foo'})
+        inject(bar='bar')(Foo.__init__)
+        self.assertDictEqual(
+            get_dependencies(Foo),
+            {
+                'foo': 'foo',
+                'bar': 'bar',
+            }
+        )
+
+        def __init__(self, other=UnrealizedInjection('other')):
+            pass
+        Foo.__init__ = __init__
+        self.assertDictEqual(get_dependencies(Foo), {'other': 'other'})
+
+        class Bar(object):
+            @inject(a='a')
+            def __init__(self, a, b=None):
+                pass
+
+        self.assertDictEqual(get_dependencies(Bar), {'a': 'a'})
+        inject(b='b')(Bar.__init__)
+        self.assertDictEqual(get_dependencies(Bar), {'a': 'a', 'b': 'b'})
+        get_dependencies(Bar)['c'] = 'c'
+        get_dependencies(Bar.__init__)['c'] = 'c'
+        self.assertDictEqual(get_dependencies(Bar), {'a': 'a', 'b': 'b'})
+
+    def test_method(self):
+        class Foo(object):
+            def method(self, foo=UnrealizedInjection('foo')):
+                pass
+
+        instance = Foo()
+        self.assertDictEqual(get_dependencies(instance.method), {'foo': 'foo'})
+        self.assertDictEqual(get_dependencies(instance.method), {'foo': 'foo'})
+
 
 class InjectTest(unittest.TestCase):
 
@@ -1,14 +1,24 @@
+import gc
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
 import unittest
 
 from wiring.dependency import Factory, inject, injected
 from wiring.graph import (
     DependencyCycleError,
+    Explanation,
     Graph,
     MissingDependencyError,
     SelfDependencyError,
     UnknownScopeError
 )
-from wiring.scopes import ProcessScope
+from wiring.interface import Interface, implements
+from wiring.providers import FactoryProvider, InstanceProvider
+from wiring.scopes import ProcessScope, SingletonScope, ThreadScope
 
 from . import ModuleTest
 
@@ -17,6 +27,15 @@ class GraphModuleTest(ModuleTest):
     module = 'wiring.graph'
 
 
+class SnapshotScope(SingletonScope):
+    pass
+
+
+@inject('name')
+def greet(name):
+    return 'hello ' + name
+
+
 class GraphTest(unittest.TestCase):
 
     def test_valid(self):
@@ -225,6 +244,206 @@ class GraphTest(unittest.TestCase):
         self.assertIn("'b'", message)
         self.assertIn("'c'", message)
 
+    def test_deep_graph(self):
+        depth = sys.getrecursionlimit() * 2
+        graph = Graph()
+        graph.register_instance(0, 0)
+        for i in range(1, depth):
+            provider = FactoryProvider(lambda previous: previous + 1)
+            provider.dependencies = {0: i - 1}
+            graph.register_provider(i, provider)
+        graph.validate()
+
+        provider = FactoryProvider(lambda last: 0)
+        provider.dependencies = {0: depth - 1}
+        graph.register_provider(0, provider)
+        with self.assertRaises(DependencyCycleError) as cm:
+            graph.validate()
+        self.assertEqual(len(cm.exception.cycle), depth)
+        self.assertSetEqual(set(cm.exception.cycle), set(range(depth)))
+
+    def test_dependency_cycle_order(self):
+        @inject('b')
+        def a(b):
+            pass
+
+        @inject('c', 'd')
+        def b(c, d):
+            pass
+
+        @inject('a')
+        def c(a):
+            pass
+
+        graph = Graph()
+        graph.register_factory('a', a)
+        graph.register_factory('b', b)
+        graph.register_factory('c', c)
+        graph.register_instance('d', 'd')
+        with self.assertRaises(DependencyCycleError) as cm:
+            graph.validate()
+        self.assertTupleEqual(cm.exception.cycle, ('a', 'b', 'c'))
+
+    def test_acquire_cycle(self):
+        created = []
+
+        def factory(name):
+            def create(*args):
+                created.append(name)
+            return create
+
+        graph = Graph()
+        graph.register_factory('a', inject('b')(factory('a')))
+        graph.register_factory('b', inject('d', 'c')(factory('b')))
+        graph.register_factory('c', inject('a')(factory('c')))
+        graph.register_factory('d', factory('d'))
+        with self.assertRaises(DependencyCycleError) as cm:
+            graph.get('a')
+        self.assertTupleEqual(cm.exception.cycle, ('a', 'b', 'c'))
+        with self.assertRaises(DependencyCycleError) as cm:
+            graph.get('c')
+        self.assertTupleEqual(cm.exception.cycle, ('c', 'a', 'b'))
+        # Nothing in the cycle was created.
+        self.assertNotIn('a', created)
+        self.assertNotIn('b', created)
+        self.assertNotIn('c', created)
+
+        graph.register_factory('e', inject('e')(factory('e')))
+        with self.assertRaises(DependencyCycleError) as cm:
+            graph.get('e')
+        self.assertTupleEqual(cm.exception.cycle, ('e',))
+
+        graph.check_cycles = False
+        with self.assertRaises(RuntimeError):
+            graph.get('a')
+
+    def test_explain(self):
+        created = []
+
+        def factory(name):
+            def create(*args, **kwargs):
+                created.append(name)
+                return name
+            return create
+
+        graph = Graph()
+        graph.register_factory(
+            'root',
+            inject('shared', 'cached', 'plain', Factory('lazy'),
+                   child='child')(factory('root'))
+        )
+        graph.register_factory(
+            'child',
+            inject('shared', 'plain')(factory('child'))
+        )
+        graph.register_factory('shared', factory('shared'), scope=ProcessScope)
+        graph.register_factory('cached', factory('cached'), scope=ProcessScope)
+        graph.register_factory('plain', factory('plain'))
+        graph.register_factory('lazy', factory('lazy'))
+        graph.get('cached')
+        del created[:]
+
+        explanation = graph.explain('root')
+        self.assertListEqual(created, [])
+        self.assertEqual(explanation.specification, 'root')
+        self.assertEqual(explanation.action, Explanation.CONSTRUCTED)
+        self.assertIsNone(explanation.argument)
+        actions = dict(
+            (node.argument, (node.specification, node.action, node.scope))
+            for node in explanation.dependencies
+        )
+        self.assertDictEqual(actions, {
+            0: ('shared', Explanation.CONSTRUCTED, ProcessScope),
+            1: ('cached', Explanation.CACHED, ProcessScope),
+            2: ('plain', Explanation.CONSTRUCTED, None),
+            3: ('lazy', Explanation.FACTORY, None),
+            'child': ('child', Explanation.CONSTRUCTED, None),
+        })
+        # Either `root` or `child` gets `shared` created, the other gets it
+        # from the scope.
+        self.assertEqual(explanation.count(), 5)
+        self.assertEqual(explanation.count(Explanation.CACHED), 2)
+        self.assertEqual(len(list(explanation.walk())), 8)
+        self.assertIn("'root' (constructed)", str(explanation))
+        self.assertIn("  1: 'cached' (cached, ProcessScope)", str(explanation))
+
+        explanation = graph.explain('root', arguments={2: None})
+        self.assertEqual(explanation.count(), 4)
+
+        with self.assertRaises(KeyError):
+            graph.explain('missing')
+        graph.register_factory('cycle', inject('cycle')(factory('cycle')))
+        with self.assertRaises(DependencyCycleError):
+            graph.explain('cycle')
+
+    def test_record_timings(self):
+        graph = Graph()
+        graph.register_factory('foo', lambda: 'foo')
+        graph.get('foo')
+        self.assertIsNone(graph.explain('foo').mean_time)
+        graph.record_timings = True
+        graph.get('foo')
+        graph.get('foo')
+        self.assertEqual(graph._timings['foo'][0], 2)
+        self.assertGreaterEqual(graph.explain('foo').mean_time, 0)
+        self.assertIn('ms)', str(graph.explain('foo')))
+
+    def test_incremental_validation(self):
+        @inject('b')
+        def a(b):
+            pass
+
+        @inject('c')
+        def b(c):
+            pass
+
+        @inject('a')
+        def c(a):
+            pass
+
+        graph = Graph()
+        graph.register_factory('a', a)
+        graph.register_factory('b', b)
+        graph.register_instance('c', 'c')
+        graph.register_instance('d', 'd')
+        graph.validate()
+
+        # Changes made directly are not tracked.
+        graph.providers['c'] = FactoryProvider(c)
+        graph.validate()
+        with self.assertRaises(DependencyCycleError):
+            graph.validate(full=True)
+        graph.register_instance('c', 'c')
+        graph.validate(full=True)
+
+        graph.register_factory('c', c)
+        with self.assertRaises(DependencyCycleError) as cm:
+            graph.validate()
+        self.assertSetEqual(set(cm.exception.cycle), {'a', 'b', 'c'})
+        # Failed validation doesn't forget about the changes.
+        with self.assertRaises(DependencyCycleError):
+            graph.validate()
+
+        graph.unregister_provider('c')
+        with self.assertRaises(MissingDependencyError) as cm:
+            graph.validate()
+        self.assertEqual(cm.exception.dependant, 'b')
+        self.assertEqual(cm.exception.dependency, 'c')
+
+        graph.register_factory('c', lambda: 'c')
+        graph.validate()
+
+        # Cycle through a specification with many dependencies.
+        graph.register_factory('e', inject('a', 'b', 'c', 'd', 'e')(c))
+        with self.assertRaises(SelfDependencyError):
+            graph.validate()
+        graph.register_factory('e', inject('a', 'b', 'c', 'd')(lambda *a: 0))
+        graph.validate()
+        graph.register_factory('c', inject('e')(lambda e: 'c'))
+        with self.assertRaises(DependencyCycleError) as cm:
+            graph.validate()
+        self.assertSetEqual(set(cm.exception.cycle), {'a', 'b', 'c', 'e'})
+
     def test_acquire_arguments(self):
         @inject(1, None, 3, foo=4)
         def function(a, b, c, foo=None, bar=None):
@@ -351,6 +570,939 @@ class GraphTest(unittest.TestCase):
         self.assertEqual(cm.exception.scope_type, FooBarScope)
         self.assertIn('FooBarScope', str(cm.exception))
 
+    def test_invalidate(self):
+        counters = {}
+
+        def factory(name):
+            def function(*args):
+                counters[name] = counters.get(name, 0) + 1
+                return (name, counters[name]) + args
+            return function
+
+        graph = Graph()
+        graph.register_factory('config', factory('config'), scope=ProcessScope)
+        graph.register_factory(
+            'service',
+            inject('config')(factory('service')),
+            scope=ThreadScope
+        )
+        graph.register_factory(
+            'application',
+            inject('service', Factory('config'))(factory('application')),
+            scope=SingletonScope
+        )
+        graph.register_factory(
+            'other',
+            factory('other'),
+            scope=SingletonScope
+        )
+        application = graph.get('application')
+        other = graph.get('other')
+        self.assertEqual(
+            application[:3],
+            ('application', 1, ('service', 1, ('config', 1)))
+        )
+
+        graph.invalidate('config', transitive=False)
+        self.assertIs(graph.get('application'), application)
+        self.assertEqual(graph.get('config'), ('config', 2))
+
+        graph.invalidate('config')
+        self.assertEqual(
+            graph.get('application')[:3],
+            ('application', 2, ('service', 2, ('config', 3)))
+        )
+        self.assertIs(graph.get('other'), other)
+
+        # Invalidating specifications that aren't cached is fine.
+        graph.invalidate('unknown')
+        graph.invalidate('config')
+        graph.invalidate('config')
+
+        class Scope(object):
+            # A scope that doesn't support removing instances.
+            def __init__(self):
+                self.cache = {}
+
+            def __getitem__(self, specification):
+                return self.cache[specification]
+
+            def __setitem__(self, specification, instance):
+                self.cache[specification] = instance
+
+            def __contains__(self, specification):
+                return specification in self.cache
+
+        graph.register_scope(Scope, Scope())
+        graph.register_factory('kept', factory('kept'), scope=Scope)
+        kept = graph.get('kept')
+        graph.invalidate('kept')
+        graph.invalidate('config')
+        self.assertIs(graph.get('kept'), kept)
+
+    def test_invalidate_child(self):
+        graph = Graph()
+        graph.register_factory('config', object, scope=SingletonScope)
+        graph.register_factory(
+            'service',
+            inject('config')(lambda config: [config]),
+            scope=SingletonScope
+        )
+        service = graph.get('service')
+
+        child = graph.child()
+        child.register_scope(ProcessScope, ProcessScope())
+        child.register_factory(
+            'local',
+            inject('config')(lambda config: [config]),
+            scope=ProcessScope
+        )
+        local = child.get('local')
+        self.assertIs(child.get('service'), service)
+        child.invalidate('config')
+        self.assertIs(graph.get('service'), service)
+        self.assertIs(child.get('service'), service)
+        self.assertIsNot(child.get('local'), local)
+
+        child.register_instance('config', 'overridden')
+        overridden = child.get('service')
+        self.assertEqual(overridden, ['overridden'])
+        child.invalidate('config')
+        self.assertIsNot(child.get('service'), overridden)
+        self.assertIs(graph.get('service'), service)
+
+    def test_register_providers(self):
+        class FooBarScope(object):
+            pass
+
+        graph = Graph()
+        with self.assertRaises(UnknownScopeError) as cm:
+            graph.register_providers({
+                'foo': FactoryProvider(lambda: 'foo'),
+                'bar': FactoryProvider(lambda: 'bar', scope=FooBarScope),
+            })
+        self.assertEqual(cm.exception.scope_type, FooBarScope)
+        self.assertNotIn('foo', graph.providers)
+
+        graph.register_providers({
+            'foo': FactoryProvider(lambda: 'foo'),
+            'bar': FactoryProvider(inject('foo')(lambda foo: foo + 'bar')),
+        })
+        graph.validate()
+        self.assertEqual(graph.get('bar'), 'foobar')
+
+    def test_lazy_module(self):
+        from .lazymodule import LazyModule
+        loaded = LazyModule.loaded
+
+        graph = Graph()
+        graph.register_lazy_module(
+            'tests.all.lazymodule:LazyModule',
+            provides=['lazy.greeting', 'lazy.message']
+        )
+        graph.register_instance('lazy.name', 'world')
+        self.assertNotIn('lazy.message', graph.providers)
+        graph.validate()
+        self.assertEqual(LazyModule.loaded, loaded)
+
+        self.assertEqual(graph.get('lazy.message'), 'hello world')
+        self.assertEqual(LazyModule.loaded, loaded + 1)
+        self.assertEqual(graph.get('lazy.greeting'), 'hello')
+        self.assertEqual(LazyModule.loaded, loaded + 1)
+
+        graph = Graph()
+        graph.register_lazy_module(
+            'tests.all.lazymodule:LazyModule',
+            provides=['lazy.message', 'lazy.missing']
+        )
+        graph.register_factory(
+            'message',
+            inject('lazy.message')(lambda message: message)
+        )
+        with self.assertRaises(MissingDependencyError) as cm:
+            graph.validate()
+        self.assertEqual(cm.exception.dependant, 'lazy.message')
+        self.assertEqual(cm.exception.dependency, 'lazy.name')
+        self.assertEqual(LazyModule.loaded, loaded + 2)
+
+        graph.register_instance('lazy.name', 'lazy')
+        graph.validate()
+        self.assertEqual(graph.get('message'), 'hello lazy')
+        with self.assertRaises(KeyError):
+            graph.get('lazy.missing')
+        self.assertEqual(LazyModule.loaded, loaded + 2)
+
+    def test_nested_lazy_modules(self):
+        graph = Graph()
+        graph.register_lazy_module(
+            'tests.all.lazymodule:LazyModule',
+            provides=['lazy.greeting']
+        )
+        graph.register_lazy_module(
+            'tests.all.lazymodule:DependentLazyModule',
+            provides=['lazy.dependent']
+        )
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(graph.get('lazy.dependent'))
+        )
+        thread.daemon = True
+        thread.start()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertListEqual(results, ['hello!'])
+
+    def test_child(self):
+        class Counter(object):
+            count = 0
+
+            def __init__(self):
+                Counter.count += 1
+
+        @inject('counter', 'name')
+        def greeting(counter, name):
+            return 'hello ' + name
+
+        parent = Graph()
+        parent.register_factory('counter', Counter, scope=SingletonScope)
+        parent.register_factory('greeting', greeting, scope=SingletonScope)
+        parent.register_instance('name', 'world')
+        parent.register_instance('other', 'other')
+        parent.validate()
+
+        child = parent.child()
+        self.assertIs(child.parent, parent)
+        self.assertIs(child.providers['other'], parent.providers['other'])
+        child.register_instance('name', 'test')
+        child.unregister_provider('other')
+        child.validate()
+        self.assertSetEqual(
+            set(child.providers),
+            {'counter', 'greeting', 'name'}
+        )
+        self.assertNotIn('other', child.providers)
+        self.assertIn('other', parent.providers)
+
+        self.assertEqual(child.get('greeting'), 'hello test')
+        self.assertEqual(parent.get('greeting'), 'hello world')
+        self.assertEqual(child.get('greeting'), 'hello test')
+        # Scoped instances not affected by overrides are shared.
+        self.assertIs(child.get('counter'), parent.get('counter'))
+        self.assertEqual(Counter.count, 1)
+
+        # Changes in the parent are visible unless overridden.
+        parent.register_instance('name', 'everyone')
+        parent.register_instance('extra', 'extra')
+        self.assertEqual(child.get('extra'), 'extra')
+        self.assertEqual(child.get('name'), 'test')
+
+        grandchild = child.child()
+        grandchild.register_instance('extra', 'grandchild')
+        self.assertEqual(grandchild.get('extra'), 'grandchild')
+        self.assertEqual(grandchild.get('greeting'), 'hello test')
+        self.assertIs(grandchild.get('counter'), parent.get('counter'))
+
+        child.invalidate('name')
+        self.assertEqual(child.get('greeting'), 'hello test')
+        self.assertEqual(Counter.count, 1)
+
+        # Scopes unregistered in the child aren't taken from the parent.
+        child.unregister_scope(SingletonScope)
+        with self.assertRaises(UnknownScopeError):
+            child.get('counter')
+        self.assertIsInstance(parent.get('counter'), Counter)
+
+    def test_child_validation(self):
+        parent = Graph()
+        parent.register_factory('foo', inject('bar')(lambda bar: bar))
+        parent.register_instance('bar', 1)
+        parent.validate()
+
+        child = parent.child()
+        child.unregister_provider('bar')
+        with self.assertRaises(MissingDependencyError) as cm:
+            child.validate()
+        self.assertEqual(cm.exception.dependant, 'foo')
+        child.register_instance('bar', 2)
+        child.validate()
+        self.assertEqual(child.get('foo'), 2)
+
+        # Changes in the parent graph are validated too.
+        parent.register_factory('baz', inject('missing')(lambda x: x))
+        with self.assertRaises(MissingDependencyError) as cm:
+            child.validate()
+        self.assertEqual(cm.exception.dependant, 'baz')
+        child.register_instance('missing', None)
+        child.validate()
+
+    def test_copy_on_write(self):
+        graph = Graph()
+        graph.register_instance('foo', 1)
+        providers = graph.providers
+        scopes = graph.scopes
+        graph.register_instance('bar', 2)
+        graph.unregister_provider('foo')
+        graph.unregister_scope(ProcessScope)
+        self.assertSetEqual(set(providers), {'foo'})
+        self.assertSetEqual(set(graph.providers), {'bar'})
+        self.assertIn(ProcessScope, scopes)
+        self.assertNotIn(ProcessScope, graph.scopes)
+
+        child = graph.child()
+        child_providers = child.providers
+        child.register_instance('baz', 3)
+        self.assertNotIn('baz', child_providers)
+        self.assertIn('baz', child.providers)
+
+    def test_single_registrations(self):
+        graph = Graph()
+        snapshots = []
+        for number in range(500):
+            graph.register_instance(number, number)
+            if number % 100 == 0:
+                snapshots.append(graph.providers)
+        for number in range(0, 500, 2):
+            graph.unregister_provider(number)
+        graph.register_instance(0, 'zero')
+        self.assertSetEqual(
+            set(graph.providers),
+            set([0]) | set(range(1, 500, 2))
+        )
+        self.assertEqual(len(graph.providers), 251)
+        for number, snapshot in enumerate(snapshots):
+            self.assertSetEqual(set(snapshot), set(range(number * 100 + 1)))
+        self.assertEqual(graph.get(0), 'zero')
+        self.assertEqual(graph.get(499), 499)
+        with self.assertRaises(KeyError):
+            graph.get(2)
+        # Using the graph merges changes into a single dictionary.
+        self.assertIs(type(graph.providers), dict)
+        graph.validate()
+
+    def test_acquire_snapshot(self):
+        graph = Graph()
+
+        def replace():
+            graph.register_instance('c', 'new')
+            return 'b'
+
+        graph.register_factory('a', inject('b', 'c')(lambda b, c: (b, c)))
+        graph.register_factory('b', replace)
+        graph.register_instance('c', 'old')
+        # Changes made while acquiring don't affect objects being acquired.
+        self.assertEqual(graph.get('a'), ('b', 'old'))
+        self.assertEqual(graph.get('c'), 'new')
+
+    def test_concurrent_changes(self):
+        graph = Graph()
+        graph.register_providers(dict(
+            (number, InstanceProvider(number)) for number in range(1000)
+        ))
+        errors = []
+
+        def read():
+            try:
+                for _ in range(20):
+                    graph.validate(full=True)
+                    providers = graph.providers
+                    for specification in providers:
+                        providers[specification]
+            except Exception as error:
+                errors.append(error)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for number in range(1000, 2000):
+            graph.register_instance(number, number)
+            graph.unregister_provider(number - 1000)
+        for reader in readers:
+            reader.join()
+        self.assertListEqual(errors, [])
+        self.assertSetEqual(set(graph.providers), set(range(1000, 2000)))
+
+    def test_subgraph(self):
+        class Scope(SingletonScope):
+            pass
+
+        graph = Graph()
+        graph.register_scope(Scope, Scope())
+        graph.unregister_scope(ThreadScope)
+        graph.register_factory('main', inject('a', 'b')(lambda a, b: a + b))
+        graph.register_factory(
+            'a',
+            inject(Factory('c'))(lambda c: c()),
+            scope=Scope
+        )
+        graph.register_instance('b', 2)
+        graph.register_instance('c', 1)
+        graph.register_factory('other', inject('main')(lambda main: main))
+        graph.register_factory('broken', inject('missing')(lambda x: x))
+
+        subgraph = graph.subgraph(['main'])
+        self.assertSetEqual(set(subgraph.providers), {'main', 'a', 'b', 'c'})
+        self.assertSetEqual(
+            set(subgraph.scopes),
+            {SingletonScope, ProcessScope, Scope}
+        )
+        self.assertIsNot(subgraph.scopes[Scope], graph.scopes[Scope])
+        subgraph.validate()
+        self.assertEqual(subgraph.get('main'), 3)
+
+        subgraph = graph.subgraph(['broken'])
+        self.assertSetEqual(set(subgraph.providers), {'broken'})
+        with self.assertRaises(MissingDependencyError):
+            subgraph.validate()
+
+        graph.unregister_provider('broken')
+        graph.validate()
+        subgraph = graph.subgraph(['other'])
+        # Subgraphs of validated graphs are valid.
+        self.assertDictEqual(subgraph._dirty, {})
+
+        graph.register_lazy_module(
+            'tests.all.lazymodule:LazyModule',
+            provides=['lazy.missing']
+        )
+        subgraph = graph.subgraph(['lazy.missing', 'main'])
+        self.assertNotIn('lazy.missing', subgraph.providers)
+        self.assertIn('main', subgraph.providers)
+        # It's not known to be valid, as a specification was missing.
+        self.assertNotEqual(subgraph._dirty, {})
+
+    def test_validate_roots(self):
+        graph = Graph()
+        graph.register_factory('main', inject('a')(lambda a: a))
+        graph.register_instance('a', 1)
+        graph.register_factory('broken', inject('missing')(lambda x: x))
+        graph.validate(roots=['main'])
+        with self.assertRaises(MissingDependencyError):
+            graph.validate(roots=['main', 'broken'])
+        with self.assertRaises(KeyError):
+            graph.validate(roots=['unknown'])
+        # Validating roots doesn't count as validating the whole graph.
+        with self.assertRaises(MissingDependencyError):
+            graph.validate()
+
+    def test_snapshot(self):
+        graph = Graph()
+        graph.register_scope(SnapshotScope, SnapshotScope())
+        graph.unregister_scope(ThreadScope)
+        graph.register_factory('greeting', greet, scope=SnapshotScope)
+        graph.register_instance('name', 'world')
+        graph.register_lazy_module(
+            'tests.all.lazymodule:LazyModule',
+            provides=['lazy.message']
+        )
+        graph.validate()
+        graph.get('greeting')
+
+        restored = Graph.loads(graph.dumps())
+        self.assertSetEqual(set(restored.providers), {'greeting', 'name'})
+        self.assertDictEqual(
+            restored.providers['greeting'].dependencies,
+            {0: 'name'}
+        )
+        self.assertSetEqual(
+            set(restored.scopes),
+            {SingletonScope, ProcessScope, SnapshotScope}
+        )
+        self.assertIsInstance(restored.scopes[SnapshotScope], SnapshotScope)
+        self.assertIsNot(
+            restored.scopes[SnapshotScope],
+            graph.scopes[SnapshotScope]
+        )
+        self.assertNotIn('greeting', restored.scopes[SnapshotScope])
+        # It was validated before being stored.
+        self.assertDictEqual(restored._dirty, {})
+        self.assertEqual(restored.get('greeting'), 'hello world')
+        restored.register_instance('lazy.name', 'lazy')
+        self.assertEqual(restored.get('lazy.message'), 'hello lazy')
+
+        child = graph.child()
+        child.register_instance('name', 'child')
+        restored = Graph.loads(child.dumps())
+        self.assertIsNone(restored.parent)
+        self.assertNotEqual(restored._dirty, {})
+        restored.validate()
+        self.assertEqual(restored.get('greeting'), 'hello child')
+
+        with self.assertRaises(ValueError):
+            Graph.loads(pickle.dumps({'format': None}))
+
+    def test_fingerprint(self):
+        def build(name):
+            graph = Graph()
+            graph.register_factory(
+                'greeting',
+                greet,
+                scope=SingletonScope
+            )
+            graph.register_factory(
+                SnapshotScope,
+                inject(Factory('greeting'))(SnapshotScope)
+            )
+            graph.register_instance('name', name)
+            return graph
+
+        graph = build('world')
+        fingerprint = graph.fingerprint()
+        self.assertRegexpMatches(fingerprint, r'^[0-9a-f]{40}$')
+        # Instances are not taken into account.
+        self.assertEqual(build('other').fingerprint(), fingerprint)
+
+        graph.register_factory('greeting', greet)
+        self.assertNotEqual(graph.fingerprint(), fingerprint)
+        graph.register_factory('greeting', greet, scope=SingletonScope)
+        self.assertEqual(graph.fingerprint(), fingerprint)
+        graph.register_factory('greeting', inject('other')(lambda name: name))
+        self.assertNotEqual(graph.fingerprint(), fingerprint)
+
+    def test_validation_cache(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cache = os.path.join(directory, 'validated')
+
+        graph = Graph()
+        graph.register_factory('greeting', greet)
+        graph.register_instance('name', 'world')
+        graph.validate(cache=cache)
+        with open(cache) as cache_file:
+            self.assertEqual(cache_file.read(), graph.fingerprint() + '\n')
+
+        checks = []
+        graph = Graph()
+        graph._check = lambda *args: checks.append(args)
+        graph.register_factory('greeting', greet)
+        graph.register_instance('name', 'world')
+        graph.validate(cache=cache)
+        self.assertListEqual(checks, [])
+        self.assertDictEqual(graph._dirty, {})
+
+        del graph._check
+        graph.unregister_provider('name')
+        with self.assertRaises(MissingDependencyError):
+            graph.validate(cache=cache)
+        with open(cache) as cache_file:
+            self.assertEqual(len(cache_file.readlines()), 1)
+
+    def test_get_all(self):
+        class IPlugin(Interface):
+            pass
+
+        class IFilter(IPlugin):
+            pass
+
+        @implements(IPlugin)
+        class Plugin(object):
+            pass
+
+        @implements(IFilter)
+        class Filter(object):
+            pass
+
+        class Other(object):
+            pass
+
+        graph = Graph()
+        graph.register_factory('plugin', Plugin)
+        graph.register_factory('filter', Filter, scope=SingletonScope)
+        graph.register_factory('other', Other)
+        graph.register_instance('instance', Plugin())
+        self.assertSetEqual(
+            graph.specs_for(IPlugin),
+            frozenset(['plugin', 'filter'])
+        )
+        self.assertSetEqual(graph.specs_for(IFilter), frozenset(['filter']))
+        plugins = graph.get_all(IPlugin)
+        self.assertSetEqual(set(plugins), set(['plugin', 'filter']))
+        self.assertIsInstance(plugins['plugin'], Plugin)
+        self.assertIs(plugins['filter'], graph.get('filter'))
+
+        graph.register_factory('plugin', Other)
+        graph.register_factory('other', Plugin)
+        self.assertSetEqual(
+            graph.specs_for(IPlugin),
+            frozenset(['other', 'filter'])
+        )
+        graph.unregister_provider('filter')
+        self.assertSetEqual(graph.specs_for(IPlugin), frozenset(['other']))
+        self.assertDictEqual(graph.get_all(IFilter), {})
+
+        child = graph.child()
+        child.register_factory('plugin', Filter)
+        child.register_factory('other', Other)
+        graph.register_factory('filter', Filter)
+        self.assertSetEqual(
+            child.specs_for(IPlugin),
+            frozenset(['plugin', 'filter'])
+        )
+        self.assertSetEqual(
+            graph.specs_for(IPlugin),
+            frozenset(['other', 'filter'])
+        )
+
+    def test_get_many(self):
+        class Plain(object):
+            pass
+
+        graph = Graph()
+        graph.register_factory('plain', Plain)
+        graph.register_factory('singleton', Plain, scope=SingletonScope)
+        graph.register_factory(
+            'pair',
+            inject('plain', 'singleton')(lambda plain, singleton: (
+                plain,
+                singleton
+            ))
+        )
+        graph.register_factory('proxy', inject(Factory('plain'))(
+            lambda factory: factory
+        ))
+
+        plain, singleton, pair, proxy = graph.get_many(
+            ['plain', 'singleton', 'pair', 'proxy']
+        )
+        self.assertIsInstance(plain, Plain)
+        self.assertIs(pair[1], singleton)
+        self.assertIsNot(pair[0], plain)
+        self.assertIsInstance(proxy(), Plain)
+        self.assertListEqual(graph.get_many([]), [])
+
+        plain, pair, other = graph.get_many(
+            ['plain', 'pair', 'plain'],
+            share=True
+        )
+        self.assertIs(pair[0], plain)
+        self.assertIs(other, plain)
+        self.assertIsNot(graph.get('plain'), plain)
+
+        graph.register_factory('cycle', inject('cycle')(lambda cycle: None))
+        with self.assertRaises(DependencyCycleError):
+            graph.get_many(['plain', 'cycle'])
+        with self.assertRaises(KeyError):
+            graph.get_many(['plain', 'missing'])
+
+    def test_acquire_batch(self):
+        class Dependency(object):
+            pass
+
+        class Entity(object):
+            def __init__(self, row_id, dependency=None, scoped=None):
+                self.row_id = row_id
+                self.dependency = dependency
+                self.scoped = scoped
+
+        graph = Graph()
+        graph.register_factory('dependency', Dependency)
+        graph.register_factory('scoped', Dependency, scope=SingletonScope)
+        graph.register_factory(
+            'entity',
+            inject(dependency='dependency', scoped='scoped')(
+                lambda row_id, **kwargs: Entity(row_id, **kwargs)
+            )
+        )
+
+        entities = graph.acquire_batch(
+            'entity',
+            [{0: 1}, {0: 2}, {0: 3, 'dependency': None}]
+        )
+        self.assertListEqual([entity.row_id for entity in entities], [1, 2, 3])
+        self.assertIsInstance(entities[0].dependency, Dependency)
+        self.assertIs(entities[1].dependency, entities[0].dependency)
+        self.assertIsNone(entities[2].dependency)
+        self.assertIs(entities[0].scoped, graph.get('scoped'))
+        self.assertIs(entities[2].scoped, graph.get('scoped'))
+        self.assertListEqual(graph.acquire_batch('entity', []), [])
+
+        consumed = []
+
+        def arguments():
+            for row_id in range(3):
+                consumed.append(row_id)
+                yield {'row_id': row_id}
+
+        entities = graph.acquire_batch('entity', arguments(), lazy=True)
+        self.assertListEqual(consumed, [])
+        self.assertEqual(next(entities).row_id, 0)
+        self.assertListEqual(consumed, [0])
+        self.assertListEqual([entity.row_id for entity in entities], [1, 2])
+
+        graph.register_factory('singleton', lambda value: [value],
+                               scope=SingletonScope)
+        self.assertListEqual(
+            graph.acquire_batch('singleton', [{0: 1}, {0: 2}]),
+            [[1], [1]]
+        )
+        with self.assertRaises(KeyError):
+            graph.acquire_batch('missing', [{}], lazy=True)
+        graph.register_factory('unknown', object, scope=ProcessScope)
+        graph.unregister_scope(ProcessScope)
+        with self.assertRaises(UnknownScopeError):
+            graph.acquire_batch('unknown', [{}], lazy=True)
+        with self.assertRaises(TypeError):
+            graph.acquire_batch('entity', [{0: 1, None: 2}])
+        graph.register_factory('cycle', inject('back')(lambda back, x: x))
+        graph.register_factory('back', inject('cycle')(lambda cycle: None))
+        with self.assertRaises(DependencyCycleError) as cm:
+            graph.acquire_batch('cycle', [{1: 1}])
+        self.assertTupleEqual(cm.exception.cycle, ('cycle', 'back'))
+
+    def test_stream(self):
+        @inject(local='local', offset='offset')
+        def transform(item, local=None, offset=None):
+            return item + offset, local
+
+        graph = Graph()
+        graph.register_instance('offset', 100)
+        graph.register_factory('local', object, scope=ThreadScope)
+        graph.register_function('transform', transform)
+
+        results = list(graph.stream('transform', range(50), workers=4))
+        self.assertListEqual(
+            [value for value, _ in results],
+            list(range(100, 150))
+        )
+        # Each worker has its own thread-scoped dependencies.
+        locals_ = set(local for _, local in results)
+        self.assertLessEqual(len(locals_), 4)
+        self.assertNotIn(graph.get('local'), locals_)
+
+        results = graph.stream('transform', range(50), workers=3,
+                               ordered=False)
+        self.assertListEqual(
+            sorted(value for value, _ in results),
+            list(range(100, 150))
+        )
+        self.assertListEqual(list(graph.stream('transform', [])), [])
+
+        with self.assertRaises(ValueError):
+            graph.stream('transform', [], workers=0)
+
+    def test_stream_backpressure(self):
+        consumed = []
+
+        def items():
+            for item in range(100):
+                consumed.append(item)
+                yield item
+
+        graph = Graph()
+        graph.register_instance('double', lambda item: item * 2)
+        results = graph.stream('double', items(), workers=2, buffer=3)
+        self.assertListEqual(consumed, [])
+        self.assertEqual(next(results), 0)
+        self.assertLessEqual(len(consumed), 4)
+        self.assertEqual(sum(results), sum(range(1, 100)) * 2)
+        self.assertEqual(len(consumed), 100)
+
+    def test_stream_errors(self):
+        def fail(item):
+            if item == 3:
+                raise ValueError(item)
+            return item
+
+        graph = Graph()
+        graph.register_instance('fail', fail)
+        results = graph.stream('fail', range(10), workers=2)
+        with self.assertRaises(ValueError):
+            list(results)
+        with self.assertRaises(KeyError):
+            next(graph.stream('missing', range(10)))
+
+        # Failure of a later item is raised after earlier results.
+        failed = threading.Event()
+
+        def fail_second(item):
+            if item == 1:
+                failed.set()
+                raise ValueError(item)
+            failed.wait(5)
+            return item
+
+        graph.register_instance('fail_second', fail_second)
+        results = graph.stream('fail_second', range(2), workers=2)
+        self.assertEqual(next(results), 0)
+        with self.assertRaises(ValueError):
+            next(results)
+
+        # Buffered items are not called after the generator is closed.
+        calls = []
+        release = threading.Event()
+
+        def block(item):
+            calls.append(item)
+            if item:
+                release.wait(5)
+            return item
+
+        graph.register_instance('block', block)
+        results = graph.stream('block', range(100), buffer=20)
+        self.assertEqual(next(results), 0)
+        results.close()
+        release.set()
+        for thread in threading.enumerate():
+            if thread.name == 'wiring-stream':
+                thread.join(5)
+        self.assertLessEqual(len(calls), 2)
+
+    def test_getter(self):
+        graph = Graph()
+        graph.register_instance('offset', 10)
+        graph.register_factory(
+            'add',
+            inject(offset='offset')(lambda value, offset=0: value + offset)
+        )
+        graph.register_factory('singleton', object, scope=SingletonScope)
+
+        add = graph.getter('add')
+        self.assertIsInstance(add, Graph.FactoryProxy)
+        self.assertEqual(add(1), 11)
+        self.assertEqual(add(1, offset=2), 3)
+        self.assertEqual(add(value=5), 15)
+        providers = add._providers
+        self.assertEqual(add(2), 12)
+        self.assertIs(add._providers, providers)
+
+        # Handles notice changes of the graph.
+        graph.register_instance('offset', 20)
+        self.assertEqual(add(1), 21)
+        self.assertIsNot(add._providers, providers)
+
+        singleton = graph.getter('singleton')
+        instance = singleton()
+        self.assertIs(instance, graph.get('singleton'))
+        graph.register_scope(SingletonScope, SingletonScope())
+        self.assertIsNot(singleton(), instance)
+        self.assertIs(singleton(), graph.get('singleton'))
+        graph.unregister_scope(SingletonScope)
+        with self.assertRaises(UnknownScopeError):
+            singleton()
+
+        missing = graph.getter('missing')
+        with self.assertRaises(KeyError):
+            missing()
+
+        child = graph.child()
+        child.register_instance('offset', 30)
+        self.assertEqual(child.getter('add')(1), 31)
+
+    def test_factory_getter(self):
+        @inject(Factory('value'))
+        def collect(value_factory):
+            return value_factory
+
+        graph = Graph()
+        graph.register_factory('value', lambda number: [number])
+        graph.register_factory('collect', collect)
+        factory = graph.get('collect')
+        self.assertListEqual(factory(1), [1])
+        self.assertIsNotNone(factory._plan)
+        graph.register_factory('value', lambda number: (number,))
+        self.assertTupleEqual(factory(2), (2,))
+
+    def test_scope_arguments(self):
+        class Connection(object):
+            def __init__(self, read_only=False):
+                self.read_only = read_only
+
+        @inject(Factory('connection'))
+        def connections(factory):
+            return factory
+
+        graph = Graph()
+        graph.register_factory('connection', Connection, scope=SingletonScope)
+        graph.register_factory('connections', connections)
+        factory = graph.get('connections')
+        # By default arguments are ignored for cached objects.
+        self.assertFalse(factory(read_only=False).read_only)
+        self.assertFalse(factory(read_only=True).read_only)
+
+        graph = Graph()
+        graph.scope_arguments = True
+        graph.register_factory('connection', Connection, scope=SingletonScope)
+        graph.register_factory('connections', connections)
+        factory = graph.get('connections')
+        read_only = factory(read_only=True)
+        writable = factory(read_only=False)
+        self.assertTrue(read_only.read_only)
+        self.assertFalse(writable.read_only)
+        self.assertIs(factory(read_only=True), read_only)
+        self.assertIs(graph.get('connection', read_only=True), read_only)
+        self.assertIs(graph.getter('connection')(read_only=False), writable)
+        self.assertIsNot(graph.get('connection', True), read_only)
+        self.assertIsNot(graph.get('connection'), read_only)
+        self.assertIs(graph.get('connection'), graph.get('connection'))
+        self.assertListEqual(
+            graph.acquire_batch(
+                'connection',
+                [{'read_only': True}, {'read_only': False}]
+            ),
+            [read_only, writable]
+        )
+        self.assertEqual(
+            graph.explain('connection', {'read_only': True}).action,
+            Explanation.CACHED
+        )
+        self.assertEqual(
+            graph.explain('connection', {'read_only': None}).action,
+            Explanation.CONSTRUCTED
+        )
+
+        # Unhashable arguments are not cached.
+        unhashable = graph.get('connection', read_only=[])
+        self.assertIsNot(graph.get('connection', read_only=[]), unhashable)
+
+        graph.invalidate('connection')
+        self.assertIsNot(factory(read_only=True), read_only)
+        self.assertIsNot(factory(read_only=False), writable)
+
+        # Keys of objects dropped by scopes aren't kept.
+        graph.register_factory('thread', Connection, scope=ThreadScope)
+        thread = threading.Thread(
+            target=lambda: [
+                graph.get('thread', read_only=index) for index in range(100)
+            ]
+        )
+        thread.start()
+        thread.join()
+        del thread
+        gc.collect()
+        self.assertEqual(len(graph._argument_keys.get('thread', {})), 0)
+        graph.get('thread', read_only=True)
+        self.assertEqual(len(graph._argument_keys['thread']), 1)
+        graph.invalidate('thread')
+        self.assertNotIn('thread', graph._argument_keys)
+
+    def test_plans(self):
+        graph = Graph()
+        graph.register_instance('a', 1)
+        graph.register_factory('b', inject('a')(lambda a: a + 1))
+        self.assertEqual(graph.get('b'), 2)
+        plan = graph._plans['b']
+        self.assertEqual(graph.get('b'), 2)
+        self.assertIs(graph._plans['b'], plan)
+
+        # Replacing dependencies rebuilds the plan.
+        graph.providers['b'].dependencies = {0: 'a', 'extra': 'a'}
+        with self.assertRaises(TypeError):
+            graph.get('b')
+        graph.register_factory('b', inject('a')(lambda a: a + 2))
+        self.assertNotIn('b', graph._plans)
+        self.assertEqual(graph.get('b'), 3)
+
+        # Child graphs use plans of their parents for inherited providers.
+        child = graph.child()
+        self.assertEqual(child.get('b'), 3)
+        self.assertNotIn('b', child._plans)
+        child.register_instance('a', 5)
+        self.assertEqual(child.get('b'), 7)
+        self.assertNotIn('b', child._plans)
+        child.register_factory('b', inject('a')(lambda a: a))
+        self.assertEqual(child.get('b'), 5)
+        self.assertIn('b', child._plans)
+        self.assertEqual(graph.get('b'), 3)
+
     def test_unregister_provider(self):
         graph = Graph()
         graph.register_instance('foo', 'bar')
@@ -0,0 +1,124 @@
+import threading
+import unittest
+
+from wiring.dependency import inject
+from wiring.graph import Graph, MissingDependencyError
+from wiring.handle import GraphHandle
+from wiring.scopes import SingletonScope
+
+from . import ModuleTest
+
+
+class HandleModuleTest(ModuleTest):
+    module = 'wiring.handle'
+
+
+class Resource(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@inject('name')
+def open_resource(name):
+    return Resource(name)
+
+
+def make_graph(name):
+    graph = Graph()
+    graph.register_instance('name', name)
+    graph.register_factory(
+        'resource',
+        open_resource,
+        scope=SingletonScope
+    )
+    return graph
+
+
+class GraphHandleTest(unittest.TestCase):
+
+    def test_swap(self):
+        first = make_graph('first')
+        handle = GraphHandle(first)
+        self.assertIs(handle.graph, first)
+        resource = handle.get('resource')
+        self.assertEqual(resource.name, 'first')
+
+        second = make_graph('second')
+        self.assertIs(handle.swap(second, warm=['resource']), first)
+        self.assertIs(handle.graph, second)
+        self.assertTrue(resource.closed)
+        self.assertEqual(handle.acquire('resource').name, 'second')
+        self.assertFalse(handle.get('resource').closed)
+
+    def test_drain(self):
+        handle = GraphHandle(make_graph('first'))
+        with handle.using() as graph:
+            resource = graph.get('resource')
+            handle.swap(make_graph('second'))
+            # The request still uses the previous graph.
+            self.assertFalse(resource.closed)
+            self.assertIs(graph.get('resource'), resource)
+            self.assertEqual(handle.get('resource').name, 'second')
+        self.assertTrue(resource.closed)
+
+    def test_shared_scopes(self):
+        parent = make_graph('parent')
+        handle = GraphHandle(parent)
+        resource = handle.get('resource')
+        child = parent.child()
+        child.register_instance('other', None)
+        handle.swap(child)
+        # Scope instances are shared with the child graph.
+        self.assertFalse(resource.closed)
+        self.assertIs(handle.get('resource'), resource)
+
+    def test_invalid(self):
+        first = make_graph('first')
+        handle = GraphHandle(first)
+        resource = handle.get('resource')
+        second = make_graph('second')
+        second.unregister_provider('name')
+        with self.assertRaises(MissingDependencyError):
+            handle.swap(second)
+        self.assertIs(handle.graph, first)
+        self.assertFalse(resource.closed)
+
+    def test_reload(self):
+        closed = []
+        handle = GraphHandle(make_graph('first'), close=closed.append)
+        resource = handle.get('resource')
+        started = threading.Event()
+        release = threading.Event()
+
+        def build():
+            started.set()
+            release.wait()
+            return make_graph('second')
+
+        thread = handle.reload(build, warm=['resource'])
+        started.wait()
+        # The current graph is used while the new one is built.
+        self.assertIs(handle.get('resource'), resource)
+        release.set()
+        thread.join()
+        self.assertIsNone(thread.error)
+        self.assertIs(handle.graph, thread.graph)
+        self.assertListEqual(closed, [resource])
+        self.assertEqual(handle.get('resource').name, 'second')
+
+    def test_reload_error(self):
+        first = make_graph('first')
+        handle = GraphHandle(first)
+
+        def build():
+            raise ValueError()
+
+        thread = handle.reload(build)
+        thread.join()
+        self.assertIsInstance(thread.error, ValueError)
+        self.assertIs(handle.graph, first)
@@ -10,6 +10,7 @@ from wiring.interface import (
     Method,
     MethodValidationError,
     MissingAttributeError,
+    add_implemented_interfaces,
     get_implemented_interfaces,
     implements,
     implements_only,
@@ -288,6 +289,20 @@ class InterfaceTest(unittest.TestCase):
             ]
         )
 
+    def test_bit(self):
+        class IObject(Interface):
+            bit = """Not a bit."""
+
+        class IPerson(IObject):
+            pass
+
+        bits = (Interface.bit, IObject.bit, IPerson.bit)
+        self.assertEqual(len(set(bits)), 3)
+        for bit in bits:
+            self.assertIsInstance(bit, six.integer_types)
+            self.assertEqual(bin(bit).count('1'), 1)
+        self.assertIn('bit', IObject.attributes)
+
     def test_check_compliance(self):
         class IPerson(Interface):
             first_name = """First name."""
@@ -423,6 +438,85 @@ class InterfaceTest(unittest.TestCase):
 
         IManager.check_compliance(ValidManager())
 
+    def test_check_compliance_cache(self):
+        class IPerson(Interface):
+            name = """Full name."""
+
+            def greet():
+                """Returns a greeting."""
+
+        class Person(object):
+            def __init__(self, name=None):
+                if name is not None:
+                    self.name = name
+
+            def greet(self):
+                return "Hello"
+
+        IPerson.check_compliance(Person("John Doe"))
+        # Attributes not defined by the class are checked for each instance.
+        with self.assertRaises(MissingAttributeError) as cm:
+            IPerson.check_compliance(Person())
+        self.assertEqual(cm.exception.attribute_name, 'name')
+        IPerson.check_compliance(Person("Jane Doe"))
+
+        def greet(self, foobar):
+            return "Hello"
+        overriding = Person("John Doe")
+        overriding.greet = greet
+        with self.assertRaises(MethodValidationError):
+            IPerson.check_compliance(overriding)
+
+        Person.greet = greet
+        with self.assertRaises(MethodValidationError):
+            IPerson.check_compliance(Person("John Doe"))
+
+        del Person.greet
+        with self.assertRaises(MissingAttributeError) as cm:
+            IPerson.check_compliance(Person("John Doe"))
+        self.assertEqual(cm.exception.attribute_name, 'greet')
+
+        class Named(object):
+            name = "Nobody"
+
+            def greet(self):
+                return "Hi"
+
+        class NamedPerson(Named):
+            pass
+
+        IPerson.check_compliance(NamedPerson())
+        Named.greet = greet
+        with self.assertRaises(MethodValidationError):
+            IPerson.check_compliance(NamedPerson())
+
+    def test_check_compliance_descriptors(self):
+        class IPerson(Interface):
+            name = """Full name."""
+            age = """Age in years."""
+
+        class Person(object):
+            __slots__ = ('name',)
+
+            def __init__(self, name=None):
+                if name is not None:
+                    self.name = name
+
+            @property
+            def age(self):
+                if getattr(self, 'name', None) == 'Unborn':
+                    raise AttributeError('age')
+                return 30
+
+        IPerson.check_compliance(Person("John Doe"))
+        with self.assertRaises(MissingAttributeError) as cm:
+            IPerson.check_compliance(Person())
+        self.assertEqual(cm.exception.attribute_name, 'name')
+        with self.assertRaises(MissingAttributeError) as cm:
+            IPerson.check_compliance(Person('Unborn'))
+        self.assertEqual(cm.exception.attribute_name, 'age')
+        IPerson.check_compliance(Person("Jane Doe"))
+
     def test_docstring(self):
         class IObject(Interface):
             """Foo bar."""
@@ -589,3 +683,42 @@ class DeclarationTest(unittest.TestCase):
         self.assertNotIsImplementation(duck, IObject)
         self.assertNotIsImplementation(duck, [IPerson, IDuck])
         self.assertNotIsImplementation(duck, [IDuck, IObject, IPerson])
+
+    def test_isimplementation_redeclared(self):
+        class IObject(Interface):
+            pass
+
+        class IPerson(IObject):
+            pass
+
+        class Object(object):
+            pass
+
+        class Person(Object):
+            pass
+
+        self.assertSetEqual(get_implemented_interfaces(Person), set())
+        self.assertNotIsImplementation(Person(), IObject)
+        self.assertNotIsImplementation(Person, IObject)
+        self.assertIsImplementation(Person(), [])
+
+        implements(IObject)(Object)
+        self.assertIsImplementation(Person, IObject)
+        self.assertIsImplementation(Person(), [IObject])
+        self.assertNotIsImplementation(Person(), IPerson)
+
+        implements(IPerson)(Person)
+        self.assertIsImplementation(Person(), IPerson)
+        self.assertIsImplementation(Person, (IObject, IPerson))
+
+        implements_only()(Person)
+        self.assertNotIsImplementation(Person(), IPerson)
+        self.assertNotIsImplementation(Person, IObject)
+        self.assertIsImplementation(Object(), IObject)
+
+        add_implemented_interfaces(Person, [IPerson])
+        self.assertIsImplementation(Person, [IObject, IPerson])
+        self.assertIsImplementation(Person, iter([IObject, IPerson]))
+        self.assertNotIsImplementation(Person, Interface)
+        self.assertNotIsImplementation(Person, [IObject, object])
+        self.assertNotIsImplementation(Person, object)
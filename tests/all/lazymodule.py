@@ -0,0 +1,28 @@
+from wiring import Module, inject, provides
+
+
+class LazyModule(Module):
+    loaded = 0
+
+    instances = {
+        'lazy.greeting': 'hello',
+    }
+
+    def __init__(self):
+        super(LazyModule, self).__init__()
+        LazyModule.loaded += 1
+
+    @provides('lazy.message')
+    @inject('lazy.greeting', 'lazy.name')
+    def provide_message(self, greeting, name):
+        return '{} {}'.format(greeting, name)
+
+
+class DependentLazyModule(Module):
+    def add_to(self, graph):
+        # Needs an object provided by another lazy module of the same graph.
+        graph.register_instance(
+            'lazy.dependent',
+            graph.get('lazy.greeting') + '!'
+        )
+        super(DependentLazyModule, self).add_to(graph)
@@ -0,0 +1,228 @@
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from wiring.categories import Category
+from wiring.dependency import Factory, UnrealizedInjection
+from wiring.graph import Graph
+from wiring.manifest import ManifestError, build_manifest, load_manifest
+from wiring.providers import FactoryProvider
+
+from . import ModuleTest
+
+
+MODULE_SOURCE = textwrap.dedent('''
+    from wiring import (
+        Category,
+        Factory,
+        FactoryProvider,
+        Module,
+        SingletonScope,
+        inject,
+        injected,
+        provides,
+        scope
+    )
+
+
+    class Database(Category):
+        pass
+
+
+    class Connection(object):
+        def __init__(self, url=injected(Database('url'))):
+            self.url = url
+
+
+    @inject(connection_factory=Factory(Connection))
+    def query(sql, connection_factory=None):
+        return connection_factory().url, sql
+
+
+    class ManifestModule(Module):
+        instances = {
+            Database('url'): 'sqlite://',
+        }
+        providers = {
+            Connection: FactoryProvider(Connection, scope=SingletonScope),
+        }
+        functions = {
+            'query': query,
+        }
+
+        @provides('greeting')
+        @scope(SingletonScope)
+        def provide_greeting(self, connection=injected(Connection)):
+            return 'hello ' + connection.url
+''')
+
+
+class ManifestModuleTest(ModuleTest):
+    module = 'wiring.manifest'
+
+
+class PicklingTest(unittest.TestCase):
+
+    def test_specifications(self):
+        for specification in (Category('a', 1), Factory('a', 1), Factory(7),
+                              UnrealizedInjection('a', 1)):
+            restored = pickle.loads(pickle.dumps(specification, 2))
+            self.assertEqual(restored, specification)
+            self.assertIs(type(restored), type(specification))
+
+
+class ManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source_path = os.path.join(
+            self.directory,
+            'wiring_manifest_example.py'
+        )
+        with open(self.source_path, 'w') as source:
+            source.write(MODULE_SOURCE)
+        self.manifest_path = os.path.join(self.directory, 'test.manifest')
+        sys.path.insert(0, self.directory)
+
+    def tearDown(self):
+        sys.path.remove(self.directory)
+        sys.modules.pop('wiring_manifest_example', None)
+        sys.modules.pop('wiring_manifest_base', None)
+        shutil.rmtree(self.directory)
+
+    def _check_graph(self, graph):
+        graph.validate()
+        self.assertEqual(graph.get('greeting'), 'hello sqlite://')
+        self.assertEqual(
+            graph.get('query')('SELECT 1'),
+            ('sqlite://', 'SELECT 1')
+        )
+
+    def test_build_and_load(self):
+        build_manifest(
+            'wiring_manifest_example:ManifestModule',
+            self.manifest_path
+        )
+        graph = Graph()
+        self.assertTrue(load_manifest(self.manifest_path, graph))
+        module = sys.modules['wiring_manifest_example']
+        self.assertSetEqual(
+            set(graph.providers.keys()),
+            {'greeting', 'query', module.Connection, module.Database('url')}
+        )
+        for provider in graph.providers.values():
+            if isinstance(provider, FactoryProvider):
+                # Dependencies were restored, not inspected.
+                self.assertIsNotNone(provider._dependencies)
+        self._check_graph(graph)
+
+        self._check_graph(Graph.from_manifest(self.manifest_path))
+
+    def test_stale(self):
+        build_manifest(
+            'wiring_manifest_example:ManifestModule',
+            self.manifest_path
+        )
+        with open(self.source_path, 'a') as source:
+            source.write('\n# Changed.\n')
+        module = sys.modules['wiring_manifest_example']
+        graph = Graph()
+        self.assertFalse(load_manifest(self.manifest_path, graph))
+        self.assertIs(
+            graph.providers['query'],
+            module.ManifestModule.providers['query']
+        )
+        self._check_graph(graph)
+
+    def test_stale_base_class(self):
+        base_path = os.path.join(self.directory, 'wiring_manifest_base.py')
+        with open(base_path, 'w') as source:
+            source.write(textwrap.dedent('''
+                from wiring import inject
+
+
+                class Base(object):
+                    @inject('greeting')
+                    def __init__(self, value):
+                        self.value = value
+            '''))
+        with open(self.source_path, 'a') as source:
+            source.write(textwrap.dedent('''
+                from wiring_manifest_base import Base
+
+
+                class Derived(Base):
+                    pass
+
+
+                class DerivedModule(ManifestModule):
+                    providers = {
+                        'derived': FactoryProvider(Derived),
+                    }
+            '''))
+        build_manifest(
+            'wiring_manifest_example:DerivedModule',
+            self.manifest_path
+        )
+        graph = Graph()
+        self.assertTrue(load_manifest(self.manifest_path, graph))
+        self.assertEqual(graph.get('derived').value, 'hello sqlite://')
+
+        with open(base_path, 'a') as source:
+            source.write('\n# Changed.\n')
+        self.assertFalse(load_manifest(self.manifest_path, Graph()))
+
+    def test_unreadable_providers(self):
+        with open(self.manifest_path, 'wb') as manifest:
+            pickle.dump(
+                {
+                    'format': 1,
+                    'python': tuple(sys.version_info[:2]),
+                    'module': 'wiring_manifest_example:ManifestModule',
+                    'sources': {},
+                },
+                manifest,
+                2
+            )
+            manifest.write(b'invalid')
+        graph = Graph()
+        self.assertFalse(load_manifest(self.manifest_path, graph))
+        self._check_graph(graph)
+
+    def test_unpicklable(self):
+        with open(self.source_path, 'a') as source:
+            source.write(textwrap.dedent('''
+                class BrokenModule(ManifestModule):
+                    functions = {
+                        'broken': lambda: None,
+                    }
+            '''))
+        with self.assertRaises(ManifestError) as cm:
+            build_manifest(
+                'wiring_manifest_example:BrokenModule',
+                self.manifest_path
+            )
+        self.assertIn("'broken'", str(cm.exception))
+
+    def test_invalid(self):
+        with open(self.manifest_path, 'wb') as manifest:
+            manifest.write(b'invalid')
+        with self.assertRaises(ManifestError):
+            load_manifest(self.manifest_path, Graph())
+
+    def test_command(self):
+        from wiring.manifest import main
+        self.assertEqual(
+            main([
+                'build',
+                'wiring_manifest_example:ManifestModule',
+                '--output',
+                self.manifest_path,
+            ]),
+            0
+        )
+        self._check_graph(Graph.from_manifest(self.manifest_path))
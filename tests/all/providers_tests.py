@@ -72,6 +72,24 @@ class FactoryProviderTest(unittest.TestCase):
             (1, 2, 3)
         )
 
+    def test_lazy_dependencies(self):
+        provider = FactoryProvider(42)
+        with self.assertRaises(TypeError):
+            provider.dependencies
+
+        def function(foo=injected('foo'), bar=None):
+            pass
+        provider = FactoryProvider(function)
+        # Declarations made after the provider was created are seen, as the
+        # function is only inspected when dependencies are needed.
+        inject(bar='bar')(function)
+        self.assertDictEqual(
+            provider.dependencies,
+            {'foo': 'foo', 'bar': 'bar'}
+        )
+        provider.dependencies = {'foo': 'bar'}
+        self.assertDictEqual(provider.dependencies, {'foo': 'bar'})
+
 
 class FunctionProviderTest(unittest.TestCase):
 
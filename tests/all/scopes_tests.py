@@ -16,6 +16,22 @@ class SingletonScopeTest(unittest.TestCase):
     def test_interface(self):
         IScope.check_compliance(SingletonScope())
 
+    def test_clear(self):
+        scope = SingletonScope()
+        scope['foo'] = 12
+        scope['bar'] = 15
+        self.assertListEqual(sorted(scope.clear()), [12, 15])
+        self.assertNotIn('foo', scope)
+        self.assertListEqual(scope.clear(), [])
+
+    def test_delete(self):
+        scope = SingletonScope()
+        scope['foo'] = 12
+        del scope['foo']
+        self.assertNotIn('foo', scope)
+        with self.assertRaises(KeyError):
+            del scope['foo']
+
     def test(self):
         scope1 = SingletonScope()
         scope2 = SingletonScope()
@@ -61,6 +77,22 @@ class ProcessScopeTest(unittest.TestCase):
     def test_interface(self):
         IScope.check_compliance(ProcessScope())
 
+    def test_clear(self):
+        scope = ProcessScope()
+        scope['foo'] = 12
+        scope['bar'] = 15
+        self.assertListEqual(sorted(scope.clear()), [12, 15])
+        self.assertNotIn('foo', scope)
+        self.assertListEqual(scope.clear(), [])
+
+    def test_delete(self):
+        scope = ProcessScope()
+        scope['foo'] = 12
+        del scope['foo']
+        self.assertNotIn('foo', scope)
+        with self.assertRaises(KeyError):
+            del scope['foo']
+
     def test(self):
         scope1 = ProcessScope()
         scope2 = ProcessScope()
@@ -119,6 +151,54 @@ class ThreadScopeTest(unittest.TestCase):
     def test_interface(self):
         IScope.check_compliance(ThreadScope())
 
+    def test_clear(self):
+        scope = ThreadScope()
+        scope['foo'] = 12
+        stored = threading.Event()
+        cleared = threading.Event()
+        results = []
+
+        def thread_function():
+            scope['foo'] = 13
+            stored.set()
+            cleared.wait()
+            results.append('foo' in scope)
+
+        thread = threading.Thread(target=thread_function)
+        thread.start()
+        stored.wait()
+        self.assertListEqual(sorted(scope.clear()), [12, 13])
+        cleared.set()
+        thread.join()
+        self.assertListEqual(results, [False])
+        self.assertNotIn('foo', scope)
+        self.assertListEqual(scope.clear(), [])
+
+    def test_delete(self):
+        scope = ThreadScope()
+        scope['foo'] = 12
+        started = threading.Event()
+        deleted = threading.Event()
+        results = []
+
+        def thread_function():
+            scope['foo'] = 13
+            started.set()
+            deleted.wait(10)
+            results.append('foo' in scope)
+
+        thread = threading.Thread(target=thread_function)
+        thread.start()
+        started.wait(10)
+        del scope['foo']
+        deleted.set()
+        thread.join(10)
+
+        self.assertNotIn('foo', scope)
+        self.assertListEqual(results, [False])
+        with self.assertRaises(KeyError):
+            del scope['foo']
+
     def test(self):
         scope1 = ThreadScope()
         scope2 = ThreadScope()
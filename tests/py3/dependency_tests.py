@@ -1,6 +1,8 @@
+import gc
 import unittest
+import weakref
 
-from wiring.dependency import UnrealizedInjection, get_dependencies
+from wiring.dependency import UnrealizedInjection, get_dependencies, inject
 
 
 class GetDependenciesTest(unittest.TestCase):
@@ -68,3 +70,20 @@ class GetDependenciesTest(unittest.TestCase):
                 'bar': 33,
             }
         )
+
+    def test_cached_class_collected(self):
+        class Base(object):
+            def __init__(self, **kwargs):
+                pass
+
+        class Foo(Base):
+            @inject(foo='foo')
+            def __init__(self, foo=None):
+                super().__init__()
+
+        self.assertDictEqual(get_dependencies(Foo), {'foo': 'foo'})
+        self.assertDictEqual(get_dependencies(Foo), {'foo': 'foo'})
+        reference = weakref.ref(Foo)
+        del Foo
+        gc.collect()
+        self.assertIsNone(reference())
@@ -1,9 +1,11 @@
+import gc
 import inspect
 import unittest
+import weakref
 
 import six
 
-from wiring.interface import Method, MethodValidationError
+from wiring.interface import Interface, Method, MethodValidationError
 
 
 class MethodTest(unittest.TestCase):
@@ -66,3 +68,30 @@ class MethodTest(unittest.TestCase):
             pass
         with self.assertRaises(MethodValidationError):
             method.check_compliance(invalid_implementation2)
+
+
+class InterfaceTest(unittest.TestCase):
+
+    def test_check_compliance_collected(self):
+        class IGreeter(Interface):
+            prefix = """Greeting prefix."""
+
+            def greet(name):
+                """Returns a greeting."""
+
+        class Base(object):
+            def greet(self, name):
+                return name
+
+        class Greeter(Base):
+            prefix = 'Hello'
+
+            def greet(self, name):
+                return self.prefix + super().greet(name)
+
+        IGreeter.check_compliance(Greeter())
+        IGreeter.check_compliance(Greeter())
+        reference = weakref.ref(Greeter)
+        del Greeter
+        gc.collect()
+        self.assertIsNone(reference())
@@ -9,6 +9,7 @@ from wiring.categories import *  # noqa
 from wiring.configuration import *  # noqa
 from wiring.dependency import *  # noqa
 from wiring.graph import *  # noqa
+from wiring.handle import *  # noqa
 from wiring.interface import *  # noqa
 from wiring.providers import *  # noqa
 from wiring.scopes import *  # noqa
@@ -34,6 +34,10 @@ class Category(tuple):
     def __new__(cls, *args):
         return super(Category, cls).__new__(cls, args)
 
+    def __getnewargs__(self):
+        # Arguments for `__new__()` used when unpickling.
+        return tuple(self)
+
     def __repr__(self):
         return type(self).__name__ + super(Category, self).__repr__()
 
@@ -1,4 +1,5 @@
 import collections
+import importlib
 import inspect
 
 import six
@@ -134,9 +135,18 @@ class ModuleMetaclass(type):
 
         providers = {}
 
-        for ancestor in reversed(inspect.getmro(module)):
-            if cls._is_module_class(ancestor):
+        ancestors = [
+            ancestor for ancestor in inspect.getmro(module)[1:]
+            if cls._is_module_class(ancestor)
+        ]
+        if ancestors and ancestors[1:] == ancestors[0]._module_ancestors:
+            # With linear inheritance the closest ancestor's providers
+            # already include providers of all the others.
+            providers.update(ancestors[0].providers)
+        else:
+            for ancestor in reversed(ancestors):
                 providers.update(ancestor.providers)
+        module._module_ancestors = ancestors
 
         already_provided = set()
 
@@ -185,6 +195,19 @@ class ModuleMetaclass(type):
 
         module.providers = providers
 
+        # Precompute a table of provider methods, so that registering them
+        # doesn't require searching through all attributes each time.
+        provider_methods = []
+        for name in dir(module):
+            value = getattr(module, name, None)
+            if hasattr(value, '__provides__'):
+                provider_methods.append((
+                    value.__provides__,
+                    name,
+                    getattr(value, '__scope__', None),
+                ))
+        module._provider_methods = tuple(provider_methods)
+
         return module
 
     @classmethod
@@ -234,16 +257,13 @@ class Module(object):
         """
         Register all of declared providers into a given :term:`object graph`.
         """
-        for specification, provider in six.iteritems(self.providers):
-            graph.register_provider(specification, provider)
-        for name in dir(self):
-            value = getattr(self, name)
-            if hasattr(value, '__provides__'):
-                graph.register_factory(
-                    value.__provides__,
-                    value,
-                    scope=getattr(value, '__scope__', None)
-                )
+        providers = dict(self.providers)
+        for specification, name, scope in self._provider_methods:
+            providers[specification] = FactoryProvider(
+                getattr(self, name),
+                scope=scope
+            )
+        graph.register_providers(providers)
 
 
 def provides(*specification):
@@ -290,3 +310,16 @@ def scope(scope):
         function.__scope__ = scope
         return function
     return decorator
+
+
+def _import_object(path):
+    # Imports an object given a path in form of `package.module:object`.
+    module_name, separator, name = path.partition(':')
+    if not separator or not module_name or not name:
+        raise ValueError((
+            "{} is not a valid path in form of `package.module:object`."
+        ).format(repr(path)))
+    target = importlib.import_module(module_name)
+    for attribute in name.split('.'):
+        target = getattr(target, attribute)
+    return target
@@ -1,4 +1,5 @@
 import inspect
+import weakref
 
 import six
 
@@ -96,6 +97,10 @@ class Factory(tuple):
             specification=specification
         )
 
+    def __getnewargs__(self):
+        # Arguments for `__new__()` used when unpickling.
+        return (self.specification,)
+
 
 class UnrealizedInjection(tuple):
     """
@@ -167,6 +172,10 @@ class UnrealizedInjection(tuple):
             specification=specification
         )
 
+    def __getnewargs__(self):
+        # Arguments for `__new__()` used when unpickling.
+        return (self.specification,)
+
     def __bool__(self):
         return False
 
@@ -198,6 +207,11 @@ def get_dependencies(factory):
             'db': (IDBConnection, 'archive'),
         }
 
+    Results of the inspection are cached per function and per class (for as
+    long as they are alive), so calling this function repeatedly for the same
+    factory is cheap. Each call returns a new dictionary which can be freely
+    modified by the caller.
+
     `Old-style classes`_ (from before Python 2.2) are not supported.
 
     .. _Old-style classes:
@@ -209,12 +223,35 @@ def get_dependencies(factory):
             init_check = inspect.isfunction
         else:
             init_check = inspect.ismethod
-        dependencies = {}
+        constructors = []
         if hasattr(factory, '__init__') and init_check(factory.__init__):
-            dependencies.update(get_dependencies(factory.__init__))
+            constructors.append(factory.__init__)
         if hasattr(factory, '__new__') and inspect.isfunction(factory.__new__):
-            dependencies.update(get_dependencies(factory.__new__))
-        return dependencies
+            constructors.append(factory.__new__)
+        # Constructors may be replaced or redecorated after the class was
+        # created, so cached dependencies are only valid for the same
+        # constructor functions and contents of their injection declarations.
+        key = tuple(
+            (
+                _unwrap_method(constructor),
+                dict(getattr(constructor, '__injection__', {})),
+            )
+            for constructor in constructors
+        )
+        cached = _get_cached(_class_dependencies, factory)
+        if cached is not None and _same_constructors(cached[0], key):
+            return dict(cached[1])
+        dependencies = {}
+        for constructor in constructors:
+            dependencies.update(get_dependencies(constructor))
+        # Constructors using `super()` reference the class, so they're only
+        # referenced weakly, not to keep the class alive in the cache.
+        weak_key = tuple(
+            (weakref.ref(function), injection)
+            for function, injection in key
+        )
+        _set_cached(_class_dependencies, factory, (weak_key, dependencies))
+        return dict(dependencies)
     elif inspect.isfunction(factory) or inspect.ismethod(factory):
         function = factory
     else:
@@ -223,7 +260,11 @@ def get_dependencies(factory):
     if hasattr(function, '__injection__'):
         # Function has precollected dependencies (happens when using `inject()`
         # decorator. Nothing to do here.
-        return function.__injection__
+        return dict(function.__injection__)
+
+    cached = _get_cached(_function_dependencies, _unwrap_method(function))
+    if cached is not None:
+        return dict(cached)
 
     dependencies = {}
 
@@ -246,7 +287,62 @@ def get_dependencies(factory):
             reversed(argument_specification.args),
             reversed(argument_specification.defaults)
         ))
-    return dependencies
+    _set_cached(
+        _function_dependencies,
+        _unwrap_method(function),
+        dependencies
+    )
+    return dict(dependencies)
+
+
+_function_dependencies = weakref.WeakKeyDictionary()
+"""
+Cache of dependencies found by inspecting function arguments, keyed by
+function objects.
+"""
+
+_class_dependencies = weakref.WeakKeyDictionary()
+"""
+Cache of merged constructor dependencies, keyed by classes. Values are tuples
+describing constructor functions the dependencies were collected from and
+the dependencies themselves.
+"""
+
+
+def _unwrap_method(function):
+    # Bound methods are created anew on every attribute access, so they're
+    # useless as cache keys. Arguments of the underlying function carry the
+    # same injection declarations.
+    return getattr(function, '__func__', function)
+
+
+def _same_constructors(cached, current):
+    # `cached` holds weak references to constructor functions, `current` the
+    # functions themselves.
+    if len(cached) != len(current):
+        return False
+    # Functions are compared by identity and injection declarations by
+    # contents, as `inject()` may be applied again to the same function.
+    return all(
+        a[0]() is b[0] and a[1] == b[1]
+        for a, b in zip(cached, current)
+    )
+
+
+def _get_cached(cache, key):
+    try:
+        return cache.get(key)
+    except TypeError:
+        # Object cannot be weakly referenced.
+        return None
+
+
+def _set_cached(cache, key, value):
+    try:
+        cache[key] = value
+    except TypeError:
+        # Object cannot be weakly referenced, so it won't be cached.
+        pass
 
 
 def inject(*positional_dependencies, **keyword_dependencies):
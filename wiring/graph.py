@@ -1,8 +1,25 @@
-import copy
+import collections
+import functools
+import hashlib
+import inspect
+import pickle
+import sys
+import threading
+import timeit
+import types
+import weakref
 
 import six
 
+try:
+    from collections.abc import MutableMapping
+except ImportError:  # pragma: no cover
+    # Python 2.
+    from collections import MutableMapping
+
+from wiring.configuration import _import_object
 from wiring.dependency import Factory
+from wiring.interface import get_implemented_interfaces
 from wiring.providers import (
     FactoryProvider,
     FunctionProvider,
@@ -11,12 +28,22 @@ from wiring.providers import (
 from wiring.scopes import ProcessScope, SingletonScope, ThreadScope
 
 
+if six.PY2:
+    def _reduce_method(method):
+        return getattr, (method.__self__, method.__func__.__name__)
+
+    # Python 2 cannot pickle bound methods, which are used as factories for
+    # `@provides`-decorated module methods.
+    six.moves.copyreg.pickle(types.MethodType, _reduce_method)
+
+
 __all__ = (
     'GraphValidationError',
     'SelfDependencyError',
     'MissingDependencyError',
     'DependencyCycleError',
     'UnknownScopeError',
+    'Explanation',
     'Graph',
 )
 
@@ -110,6 +137,98 @@ class UnknownScopeError(Exception):
         )
 
 
+class Explanation(object):
+    """
+    A node of a tree returned by :py:meth:`Graph.explain`, describing how an
+    object for a :term:`specification` would be obtained.
+    """
+
+    CONSTRUCTED = 'constructed'
+    """The object would be created by its :term:`provider`."""
+
+    CACHED = 'cached'
+    """The object would be taken from a :term:`scope`."""
+
+    FACTORY = 'factory'
+    """
+    A :py:class:`Graph.FactoryProxy` would be injected, so the object would be
+    created only when it's called.
+    """
+
+    def __init__(self, specification, action, argument=None, scope=None,
+                 dependencies=(), mean_time=None):
+        self.specification = specification
+        """The explained :term:`specification`."""
+        self.action = action
+        """
+        One of :py:attr:`CONSTRUCTED`, :py:attr:`CACHED` or
+        :py:attr:`FACTORY`.
+        """
+        self.argument = argument
+        """
+        Argument (an integer for positional ones) under which the object would
+        be injected into its dependant, or `None` for the explained root.
+        """
+        self.scope = scope
+        """Type of :term:`scope` of the :term:`provider`, or `None`."""
+        self.dependencies = list(dependencies)
+        """
+        List of :py:class:`Explanation` instances for :term:`dependencies
+        <dependency>` that would be acquired for a constructed object.
+        """
+        self.mean_time = mean_time
+        """
+        Mean time (in seconds) of creating an object for the specification
+        recorded by the graph, or `None` if there is no record. See
+        :py:attr:`Graph.record_timings`.
+        """
+
+    def walk(self):
+        """
+        Yields this node and all nodes below it, depth-first.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.dependencies))
+
+    def count(self, action=CONSTRUCTED):
+        """
+        Returns the number of nodes in the tree with given `action`, by default
+        the number of objects that would be created.
+        """
+        return sum(1 for node in self.walk() if node.action == action)
+
+    def __str__(self):
+        lines = []
+        stack = [(self, 0)]
+        while stack:
+            node, depth = stack.pop()
+            details = [node.action]
+            if node.scope is not None:
+                details.append(
+                    getattr(node.scope, '__name__', repr(node.scope))
+                )
+            if node.mean_time is not None:
+                details.append('{:.3f}ms'.format(node.mean_time * 1000))
+            line = '{indent}{argument}{specification} ({details})'
+            lines.append(line.format(
+                indent='  ' * depth,
+                argument=(
+                    '' if node.argument is None else
+                    '{}: '.format(node.argument)
+                ),
+                specification=repr(node.specification),
+                details=', '.join(details)
+            ))
+            stack.extend(
+                (dependency, depth + 1)
+                for dependency in reversed(node.dependencies)
+            )
+        return '\n'.join(lines)
+
+
 class Graph(object):
     """
     Respresents an :term:`object graph`. Contains registered scopes and
@@ -120,15 +239,116 @@ class Graph(object):
     class FactoryProxy(object):
         """
         A proxy object injected when `Factory(<specification>)` is requested as
-        a dependency.
+        a dependency, and returned by :py:meth:`Graph.getter`. Calling it is
+        equivalent to calling :py:meth:`Graph.get` with the
+        :term:`specification`, but the :term:`provider`, its :term:`scope` and
+        :term:`dependencies <dependency>` are looked up on the first call and
+        reused until the graph changes.
         """
 
         def __init__(self, graph, specification):
             self.graph = graph
             self.specification = specification
+            # Provider and scope tables the cached lookup was made for.
+            self._providers = None
+            self._scopes = None
+            self._plan = None
+            self._scope = None
 
         def __call__(self, *args, **kwargs):
-            return self.graph.get(self.specification, *args, **kwargs)
+            graph = self.graph
+            providers = graph.providers
+            if (self._providers is not providers or
+                    self._scopes is not graph.scopes):
+                if graph.parent is not None:
+                    # Child graphs may change with their parents, so there's
+                    # nothing to cache.
+                    return graph.get(self.specification, *args, **kwargs)
+                self._prepare(graph._snapshot())
+                providers = self._providers
+            specification = self.specification
+            if args or kwargs:
+                arguments = dict(enumerate(args))
+                arguments.update(kwargs)
+            else:
+                arguments = None
+            scope = self._scope
+            key = specification
+            if scope is not None:
+                if arguments and graph.scope_arguments:
+                    key = _ArgumentsKey.create(specification, arguments)
+                if key is not None and key in scope:
+                    return scope[key]
+            return graph._construct(
+                specification,
+                self._plan,
+                scope,
+                key,
+                arguments,
+                providers,
+                _Resolving() if graph.check_cycles else None
+            )
+
+        def _prepare(self, providers):
+            graph = self.graph
+            scopes = graph.scopes
+            try:
+                provider = providers[self.specification]
+            except KeyError:
+                if not graph._load_lazy_module(self.specification):
+                    raise
+                providers = graph._snapshot()
+                scopes = graph.scopes
+                provider = providers[self.specification]
+            plan = graph._get_plan(self.specification, provider)
+            scope = None
+            if plan.scope is not None:
+                try:
+                    scope = scopes[plan.scope]
+                except KeyError:
+                    raise UnknownScopeError(plan.scope)
+            self._plan = plan
+            self._scope = scope
+            self._providers = providers
+            self._scopes = scopes
+
+    check_cycles = True
+    """
+    Whether :py:meth:`acquire` should check for :term:`dependency cycles
+    <dependency cycle>` as it resolves dependencies, raising
+    :py:exc:`DependencyCycleError` as soon as an object turns out to depend
+    on itself, before any object in the cycle is created. Without the check
+    a cycle ends with a `RecursionError`. Graphs checked with
+    :py:meth:`validate` can't have cycles, so it can be set to `False` to
+    skip the check entirely.
+    """
+
+    scope_arguments = False
+    """
+    Whether objects acquired with arguments (for example by calling
+    a :py:class:`FactoryProxy` with some) should be cached by :term:`scopes
+    <scope>` separately for each set of arguments. By default arguments are
+    ignored if there already is a cached object for the :term:`specification`,
+    and an object created with them is cached for all future calls.
+
+    Arguments given as positional and as keyword ones are considered
+    different, even if they are the same argument of the :term:`provider`.
+    Objects acquired with arguments that aren't hashable are not cached.
+
+    The graph keeps track of keys objects were cached under, so
+    :py:meth:`invalidate` can remove all of them. Keys are referenced weakly,
+    so they're forgotten once the scope drops the object (like
+    :py:class:`wiring.scopes.ThreadScope` does when a thread ends). Custom
+    scopes that don't hold on to keys they were given won't have objects
+    cached with arguments invalidated.
+    """
+
+    record_timings = False
+    """
+    Whether :py:meth:`acquire` should measure how long :term:`providers
+    <provider>` take to create objects. Mean times are included in results
+    of :py:meth:`explain`.
+    """
 
     def __init__(self):
         self.providers = {}
@@ -136,17 +356,229 @@ class Graph(object):
         Dictionary mapping :term:`specifications <specification>` to
         :py:interface:`wiring.providers.IProvider` implementers that can
         provide the specified object.
+
+        Registering and unregistering providers doesn't modify the dictionary
+        but replaces it with an updated copy, so a reference to it is
+        a consistent snapshot that can be safely read or iterated over while
+        other threads change the graph. After single registrations, until the
+        graph is used, the copy may be a dictionary-like mapping sharing most
+        of its contents with the previous one.
         """
         self.scopes = {}
         """
         Dictionary mapping :term:`scope` types to their instances. Scope
         instances must conform to :py:interface:`wiring.scopes.IScope`
         interface.
+
+        Like :py:attr:`providers`, it's replaced with an updated copy when
+        scopes are registered or unregistered.
+        """
+        self.parent = None
         """
+        A graph this graph was created from with :py:meth:`child`, or `None`.
+        """
+        self._setup()
         self.register_scope(SingletonScope, SingletonScope())
         self.register_scope(ProcessScope, ProcessScope())
         self.register_scope(ThreadScope, ThreadScope())
 
+    def _setup(self):
+        # Held by threads replacing `providers` or `scopes` and updating
+        # structures tracking changes of the graph. Readers don't need it.
+        self._write_lock = threading.RLock()
+        # Specifications registered or unregistered since the last successful
+        # validation. It's an ordered dictionary with `None` values used as
+        # an ordered set, so problems are reported in registration order.
+        self._dirty = collections.OrderedDict()
+        # Reverse dependency index, mapping specifications to sets of
+        # specifications depending on them. It's updated lazily, when needed,
+        # for specifications in `_unindexed`. `_indexed` maps specifications
+        # to dependencies they're currently indexed with.
+        self._dependants = {}
+        self._indexed = {}
+        self._unindexed = set()
+        # Incremented on every change, so child graphs can find out if their
+        # parent has changed.
+        self._revision = 0
+        # Revisions of parent graphs at the time of last successful
+        # validation, or `None` if it's unknown if they were valid.
+        self._validated_parents = ()
+
+        # Maps specifications provided by modules registered with
+        # `register_lazy_module()` and not yet loaded to lists of
+        # specifications and a module path.
+        self._lazy_modules = {}
+        self._lazy_modules_lock = threading.Lock()
+        # Maps module paths of lazy modules to locks held while they're being
+        # loaded, and a set of those being loaded. The module is imported
+        # without holding `_lazy_modules_lock`, so that loading it can acquire
+        # other lazily provided specifications.
+        self._lazy_module_locks = {}
+        self._loading_lazy_modules = set()
+
+        # Scope instances used by a child graph for specifications affected by
+        # its overrides, and a cached set of those specifications along with
+        # revisions it was computed for.
+        self._isolated_scopes = {}
+        self._isolated_scopes_lock = threading.Lock()
+        self._overridden = (None, frozenset())
+
+        # Maps specifications to plans of acquiring their objects. They are
+        # rebuilt when providers or their dependencies are replaced.
+        self._plans = {}
+
+        # Index of interfaces implemented by provided classes, mapping
+        # interfaces to sets of specifications. Like the reverse dependency
+        # index, it's updated lazily for specifications in
+        # `_unindexed_implementers`, and `_implemented` maps specifications to
+        # interfaces they're currently indexed with.
+        self._implementers = {}
+        self._implemented = {}
+        self._unindexed_implementers = set()
+
+        # Maps specifications to numbers of created objects and total time it
+        # took, when `record_timings` is enabled.
+        self._timings = {}
+        self._timings_lock = threading.Lock()
+        # Maps specifications to dictionaries mapping identities of keys their
+        # objects were cached under along with arguments, when
+        # `scope_arguments` is enabled, to weak references to those keys.
+        self._argument_keys = {}
+        self._argument_keys_lock = threading.Lock()
+
+    def child(self):
+        """
+        Returns a new graph inheriting all :term:`providers <provider>` and
+        :term:`scopes <scope>` of this graph. Providers and scopes registered
+        or unregistered in the child graph are stored in it, without
+        affecting this one, while changes made to this graph are visible in
+        the child unless it has overridden them. Creating a child graph doesn't
+        copy anything, so it's cheap regardless of the size of this graph.
+
+        For example, a test can override a single provider without rebuilding
+        the whole application graph::
+
+            test_graph = application_graph.child()
+            test_graph.register_instance('db.url', 'sqlite://')
+
+        Scoped instances are shared with this graph, except for
+        :term:`specifications <specification>` overridden in the child graph
+        and all specifications depending on them, which are cached in separate
+        scope instances owned by the child. Those are created by calling the
+        type of the inherited scope instance with no arguments.
+
+        If this graph has been successfully validated, only changes made to
+        the child graph need to be checked by its :py:meth:`validate`.
+        """
+        child = type(self).__new__(type(self))
+        child.parent = self
+        child.providers = _Overlay(self, 'providers')
+        child.scopes = _Overlay(self, 'scopes')
+        child._setup()
+        if self._is_validated():
+            child._validated_parents = self._revisions()
+        else:
+            child._validated_parents = None
+        return child
+
+    @classmethod
+    def from_manifest(cls, path):
+        """
+        Creates a new graph and registers :term:`providers <provider>` saved
+        with :py:func:`wiring.manifest.build_manifest` in a manifest file under
+        `path`, falling back to importing the recorded :term:`module` when the
+        manifest is stale. See :py:mod:`wiring.manifest` for details.
+
+        :raises:
+            :py:exc:`wiring.manifest.ManifestError`
+        """
+        from wiring.manifest import load_manifest
+        graph = cls()
+        load_manifest(path, graph)
+        return graph
+
+    SNAPSHOT_FORMAT = 1
+    """Version of the format of data returned by :py:meth:`dumps`."""
+
+    def dumps(self, protocol=pickle.HIGHEST_PROTOCOL):
+        """
+        Returns a :py:mod:`pickle` of this graph's :term:`providers
+        <provider>` (with their :term:`dependencies <dependency>` already
+        inspected), :term:`scope` types and lazy modules, which can be turned
+        back into a graph with :py:meth:`loads`. Provided callables and scope
+        types are stored as references by import path, so they must be
+        defined at module level.
+
+        This lets a process build and validate a graph once and send it to
+        worker processes, which restore it without importing and adding
+        :term:`modules <module>` again::
+
+            data = graph.dumps()
+            ...
+            graph = Graph.loads(data)
+
+        Scoped instances are not stored. Child graphs are stored with all
+        providers inherited from their parents.
+        """
+        providers = dict(self._snapshot())
+        for provider in six.itervalues(providers):
+            # Make sure dependencies get stored instead of being inspected
+            # after loading.
+            provider.dependencies
+        scopes = dict(
+            (scope_type, type(scope))
+            for scope_type, scope in six.iteritems(self.scopes)
+        )
+        lazy_modules = {}
+        graph = self
+        while graph is not None:
+            with graph._lazy_modules_lock:
+                for specification, entry in six.iteritems(
+                        graph._lazy_modules):
+                    lazy_modules.setdefault(specification, entry)
+            graph = graph.parent
+        return pickle.dumps(
+            {
+                'format': self.SNAPSHOT_FORMAT,
+                'providers': providers,
+                'scopes': scopes,
+                'lazy_modules': lazy_modules,
+                'validated': self._is_validated(),
+            },
+            protocol
+        )
+
+    @classmethod
+    def loads(cls, data):
+        """
+        Creates a new graph from `data` returned by :py:meth:`dumps`. Each
+        :term:`scope` gets a new instance, created by calling the type of the
+        stored graph's scope instance with no arguments. If the stored graph
+        was validated, the new one doesn't need to be.
+
+        :raises:
+            ValueError
+        """
+        snapshot = pickle.loads(data)
+        if snapshot.get('format') != cls.SNAPSHOT_FORMAT:
+            raise ValueError(
+                "Unsupported graph snapshot format: {}.".format(
+                    repr(snapshot.get('format'))
+                )
+            )
+        graph = cls()
+        scopes = dict(
+            (scope_type, scope_class())
+            for scope_type, scope_class in six.iteritems(snapshot['scopes'])
+        )
+        with graph._write_lock:
+            graph.scopes = scopes
+            graph.register_providers(snapshot['providers'])
+            if snapshot['validated']:
+                graph._dirty.clear()
+        graph._lazy_modules.update(snapshot['lazy_modules'])
+        return graph
+
     def acquire(self, specification, arguments=None):
         """
         Returns an object for `specification` injecting its provider
@@ -166,61 +598,515 @@ class Graph(object):
             that wouldn't.  Positional arguments should be stored under 0-based
             integer keys.
         :raises:
-            TypeError
+            TypeError,
+            :py:exc:`DependencyCycleError`
+
+        All objects needed are created using providers registered at the time
+        of the call, even if the graph is changed by another thread before
+        they're all acquired.
         """
-        if arguments is None:
-            realized_dependencies = {}
-        else:
-            realized_dependencies = copy.copy(arguments)
+        return self._acquire(
+            specification,
+            arguments,
+            self._snapshot(),
+            _Resolving() if self.check_cycles else None
+        )
 
-        provider = self.providers[specification]
+    def _acquire(self, specification, arguments, providers, resolving,
+                 shared=None):
+        # `resolving` is a `_Resolving` tracking specifications whose
+        # dependencies are being acquired, or `None` if cycles aren't
+        # checked. `shared` is a dictionary of unscoped objects to reuse, or
+        # `None`.
+        try:
+            provider = providers[specification]
+        except KeyError:
+            if not self._load_lazy_module(specification):
+                raise
+            providers = self._snapshot()
+            provider = providers[specification]
+        plan = self._get_plan(specification, provider)
 
         scope = None
-        if provider.scope is not None:
-            try:
-                scope = self.scopes[provider.scope]
-            except KeyError:
-                raise UnknownScopeError(provider.scope)
+        key = specification
+        if plan.scope is not None:
+            scope = self._get_scope(specification, plan.scope)
+            if arguments and self.scope_arguments:
+                key = _ArgumentsKey.create(specification, arguments)
+            if key is not None and key in scope:
+                return scope[key]
+        elif shared is not None and specification in shared:
+            return shared[specification]
+        return self._construct(
+            specification,
+            plan,
+            scope,
+            key,
+            arguments,
+            providers,
+            resolving,
+            shared
+        )
 
-        if scope is not None and specification in scope:
-            return scope[specification]
+    def _construct(self, specification, plan, scope, key, arguments,
+                   providers, resolving, shared=None):
+        # Creates an object according to `plan` and stores it in `scope`
+        # under `key`, unless it's `None`.
+        if resolving is not None:
+            resolving.enter(specification)
 
-        dependencies = six.iteritems(provider.dependencies)
-        for argument, dependency_specification in dependencies:
-            if argument not in realized_dependencies:
-                if isinstance(dependency_specification, Factory):
-                    realized_dependencies[argument] = self.FactoryProxy(
-                        self,
-                        dependency_specification.specification
-                    )
-                else:
-                    realized_dependencies[argument] = self.acquire(
-                        dependency_specification
-                    )
-
-        args = []
+        args = [None] * plan.positional
         kwargs = {}
-        for argument, value in six.iteritems(realized_dependencies):
+        for argument, dependency, is_factory in plan.injected:
+            if arguments and argument in arguments:
+                continue
+            if is_factory:
+                value = self.FactoryProxy(self, dependency)
+            else:
+                value = self._acquire(
+                    dependency,
+                    None,
+                    providers,
+                    resolving,
+                    shared
+                )
             if isinstance(argument, six.integer_types):
-                # Integer keys are for positional arguments.
-                if len(args) <= argument:
-                    args.extend([None] * (argument + 1 - len(args)))
                 args[argument] = value
-            elif isinstance(argument, six.string_types):
-                # String keys are for keyword arguments.
-                kwargs[argument] = value
             else:
-                raise TypeError(
-                    "{} is not a valid argument key".format(repr(argument))
-                )
+                kwargs[argument] = value
+        if resolving is not None:
+            resolving.leave(specification)
 
-        instance = provider(*args, **kwargs)
+        if arguments:
+            _apply_arguments(args, kwargs, arguments)
+
+        if self.record_timings:
+            start = timeit.default_timer()
+            instance = plan.provider(*args, **kwargs)
+            self._record_timing(specification, timeit.default_timer() - start)
+        else:
+            instance = plan.provider(*args, **kwargs)
 
         if scope is not None:
-            scope[specification] = instance
+            if key is not None:
+                self._store(scope, key, instance)
+        elif shared is not None:
+            shared[specification] = instance
 
         return instance
 
+    def _store(self, scope, key, instance):
+        scope[key] = instance
+        if type(key) is _ArgumentsKey:
+            # Remember the key, so `invalidate()` can find it. If the scope
+            # already had an equal key, this one is forgotten right away, as
+            # the other one was remembered before.
+            with self._argument_keys_lock:
+                keys = self._argument_keys.setdefault(key.specification, {})
+                keys[id(key)] = weakref.ref(
+                    key,
+                    functools.partial(_forget_key, keys, id(key))
+                )
+
+    def _get_plan(self, specification, provider):
+        # Returns a plan for acquiring an object from `provider`, sharing plans
+        # built by parent graphs for the same provider.
+        dependencies = provider.dependencies
+        graph = self
+        while graph is not None:
+            plan = graph._plans.get(specification)
+            if (plan is not None and plan.provider is provider and
+                    plan.dependencies is dependencies):
+                return plan
+            graph = graph.parent
+        plan = _Plan(provider, dependencies)
+        self._plans[specification] = plan
+        return plan
+
+    def acquire_batch(self, specification, arguments, lazy=False):
+        """
+        Returns a list of objects for `specification`, one for each dictionary
+        of arguments in `arguments` iterable, as if each was acquired with
+        :py:meth:`acquire`. :term:`Dependencies <dependency>` not given in
+        arguments are acquired only once for the whole batch and injected
+        into all created objects, so objects without a :term:`scope` are
+        shared among them, while scoped ones are taken from their scopes as
+        usual.
+
+        For example::
+
+            entities = graph.acquire_batch(
+                Entity,
+                ({'row_id': row_id} for row_id in row_ids)
+            )
+
+        When `lazy` is `True`, a generator is returned instead, creating each
+        object when it's needed and consuming `arguments` as it goes.
+
+        :raises:
+            TypeError,
+            :py:exc:`DependencyCycleError`
+        """
+        providers = self._snapshot()
+        try:
+            provider = providers[specification]
+        except KeyError:
+            if not self._load_lazy_module(specification):
+                raise
+            providers = self._snapshot()
+            provider = providers[specification]
+        # Resolved before the generator starts, so that errors are raised
+        # here even when `lazy` is `True`.
+        plan = self._get_plan(specification, provider)
+        scope = None
+        if plan.scope is not None:
+            scope = self._get_scope(specification, plan.scope)
+        objects = self._construct_batch(
+            specification,
+            provider,
+            plan,
+            scope,
+            arguments,
+            providers
+        )
+        if lazy:
+            return objects
+        return list(objects)
+
+    def _construct_batch(self, specification, provider, plan, scope,
+                         arguments_list, providers):
+        resolving = None
+        if self.check_cycles:
+            resolving = _Resolving()
+            resolving.enter(specification)
+        # Values of dependencies acquired so far, by argument.
+        resolved = {}
+        for arguments in arguments_list:
+            key = specification
+            if scope is not None:
+                if arguments and self.scope_arguments:
+                    key = _ArgumentsKey.create(specification, arguments)
+                if key is not None and key in scope:
+                    yield scope[key]
+                    continue
+            args = [None] * plan.positional
+            kwargs = {}
+            for argument, dependency, is_factory in plan.injected:
+                if arguments and argument in arguments:
+                    continue
+                try:
+                    value = resolved[argument]
+                except KeyError:
+                    if is_factory:
+                        value = self.FactoryProxy(self, dependency)
+                    else:
+                        value = self._acquire(
+                            dependency,
+                            None,
+                            providers,
+                            resolving
+                        )
+                    resolved[argument] = value
+                if isinstance(argument, six.integer_types):
+                    args[argument] = value
+                else:
+                    kwargs[argument] = value
+            if arguments:
+                _apply_arguments(args, kwargs, arguments)
+
+            if self.record_timings:
+                start = timeit.default_timer()
+                instance = provider(*args, **kwargs)
+                self._record_timing(
+                    specification,
+                    timeit.default_timer() - start
+                )
+            else:
+                instance = provider(*args, **kwargs)
+
+            if scope is not None and key is not None:
+                self._store(scope, key, instance)
+            yield instance
+
+    def stream(self, specification, iterable, workers=1, ordered=True,
+               buffer=None):
+        """
+        Returns a generator calling a function provided for `specification`
+        (usually by :py:class:`wiring.providers.FunctionProvider`) with each
+        item of `iterable` and yielding the results. Calls are made by
+        `workers` threads, each acquiring the function once when it starts,
+        so dependencies in :py:class:`wiring.scopes.ThreadScope` are created
+        separately for each worker.
+
+        Items are taken from `iterable` only when there is room for them: at
+        most `buffer` (by default twice the number of workers) of them are
+        processed or wait to be yielded at any time. When `ordered` is `True`
+        results are yielded in order of items, otherwise as soon as they're
+        ready.
+
+        For example::
+
+            for row in graph.stream('etl.transform', rows, workers=4):
+                output.write(row)
+
+        An exception raised by the function or while acquiring it is raised
+        by the generator (when `ordered` is `True`, after results of previous
+        items), which then stops. Workers stop when the generator is
+        exhausted, closed or garbage collected, after finishing calls they
+        have already started; buffered items not started yet are dropped.
+
+        :raises:
+            ValueError
+        """
+        if workers < 1:
+            raise ValueError("At least one worker is needed.")
+        if buffer is None:
+            buffer = 2 * workers
+        if buffer < 1:
+            raise ValueError("Buffer must have room for at least one item.")
+        return self._stream(specification, iterable, workers, ordered, buffer)
+
+    def _stream(self, specification, iterable, workers, ordered, buffer):
+        tasks = six.moves.queue.Queue()
+        results = six.moves.queue.Queue()
+
+        def work():
+            try:
+                function = self.acquire(specification)
+            except Exception:
+                results.put((None, False, sys.exc_info()))
+                return
+            while True:
+                task = tasks.get()
+                if task is None:
+                    return
+                index, item = task
+                try:
+                    results.put((index, True, function(item)))
+                except Exception:
+                    results.put((index, False, sys.exc_info()))
+
+        threads = [
+            threading.Thread(target=work, name='wiring-stream')
+            for _ in range(workers)
+        ]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        items = iter(iterable)
+        exhausted = False
+        submitted = 0
+        pending = 0
+        # Results waiting for results of previous items to be yielded first.
+        waiting = {}
+        next_index = 0
+        try:
+            while True:
+                while not exhausted and pending + len(waiting) < buffer:
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    tasks.put((submitted, item))
+                    submitted += 1
+                    pending += 1
+                if not pending:
+                    return
+                index, success, value = results.get()
+                pending -= 1
+                if not ordered or index is None:
+                    if not success:
+                        six.reraise(*value)
+                    yield value
+                    continue
+                # Failures wait for results of previous items too.
+                waiting[index] = (success, value)
+                while next_index in waiting:
+                    success, value = waiting.pop(next_index)
+                    next_index += 1
+                    if not success:
+                        six.reraise(*value)
+                    yield value
+        finally:
+            # Drop items no worker has started yet, so they aren't called.
+            while True:
+                try:
+                    tasks.get_nowait()
+                except six.moves.queue.Empty:
+                    break
+            for thread in threads:
+                tasks.put(None)
+
+    def get_many(self, specifications, share=False):
+        """
+        Returns a list of objects for given :term:`specifications
+        <specification>`, in the same order, as if each was acquired with
+        :py:meth:`acquire` with no arguments, but in a single pass over one
+        snapshot of the graph.
+
+        When `share` is `True`, objects without a :term:`scope` are created
+        only once for the whole call and the same instance is injected
+        everywhere it's needed, as if they were in a scope living only for
+        the call.
+
+        :raises:
+            :py:exc:`DependencyCycleError`
+        """
+        providers = self._snapshot()
+        resolving = _Resolving() if self.check_cycles else None
+        shared = {} if share else None
+        return [
+            self._acquire(specification, None, providers, resolving, shared)
+            for specification in specifications
+        ]
+
+    def specs_for(self, interface):
+        """
+        Returns a `frozenset` of :term:`specifications <specification>`
+        provided by :py:class:`wiring.providers.FactoryProvider` instances
+        whose factories are classes declared with
+        :py:func:`wiring.interface.implements` to implement `interface`,
+        directly or through a derived :term:`interface`.
+
+        It uses an index updated as the graph changes, so it doesn't look at
+        all providers on every call. Interfaces declared after the class was
+        registered aren't seen until it's registered again, and
+        specifications of not yet loaded lazy modules aren't included.
+        """
+        return frozenset(self._specs_for(interface, self._snapshot()))
+
+    def get_all(self, interface):
+        """
+        Returns a dictionary mapping :term:`specifications <specification>`
+        returned by :py:meth:`specs_for` for `interface` to objects acquired
+        for them as with :py:meth:`get_many`::
+
+            for plugin in graph.get_all(IPlugin).values():
+                plugin.dispatch(event)
+
+        :raises:
+            :py:exc:`DependencyCycleError`
+        """
+        providers = self._snapshot()
+        resolving = _Resolving() if self.check_cycles else None
+        return dict(
+            (
+                specification,
+                self._acquire(specification, None, providers, resolving)
+            )
+            for specification in self._specs_for(interface, providers)
+        )
+
+    def _specs_for(self, interface, providers):
+        # Indexed specifications may have been overridden or removed since,
+        # so they're checked against the snapshot.
+        for specification in self._implementers_of(interface):
+            provider = providers.get(specification)
+            if (provider is not None and
+                    interface in _implemented_interfaces(provider)):
+                yield specification
+
+    def _record_timing(self, specification, duration):
+        with self._timings_lock:
+            count, total = self._timings.get(specification, (0, 0.0))
+            self._timings[specification] = (count + 1, total + duration)
+
+    def explain(self, specification, arguments=None):
+        """
+        Returns an :py:class:`Explanation` tree showing what
+        :py:meth:`acquire` would do to obtain an object for `specification`
+        with given `arguments`, without creating any objects: which objects
+        would be created, which would be taken from :term:`scopes <scope>`
+        (as seen by the current thread) and where
+        :py:class:`Graph.FactoryProxy` instances would be injected.
+
+        For example, to find out how many objects a request would create::
+
+            graph.explain('web.handler').count()
+
+        Lazy modules providing needed :term:`specifications <specification>`
+        are loaded, as they would be by :py:meth:`acquire`.
+
+        :raises:
+            KeyError,
+            :py:exc:`DependencyCycleError`
+        """
+        return self._explain(
+            specification,
+            None,
+            arguments,
+            self._snapshot(),
+            _Resolving(),
+            set()
+        )
+
+    def _explain(self, specification, argument, arguments, providers,
+                 resolving, scheduled):
+        # `scheduled` holds pairs of scope instance identifiers and
+        # specifications that would already be cached when needed again.
+        try:
+            provider = providers[specification]
+        except KeyError:
+            if not self._load_lazy_module(specification):
+                raise
+            providers = self._snapshot()
+            provider = providers[specification]
+
+        scope = None
+        key = specification
+        if provider.scope is not None:
+            scope = self._get_scope(specification, provider.scope)
+            if arguments and self.scope_arguments:
+                key = _ArgumentsKey.create(specification, arguments)
+            if key is not None and (key in scope or
+                                    (id(scope), key) in scheduled):
+                return Explanation(
+                    specification,
+                    Explanation.CACHED,
+                    argument=argument,
+                    scope=provider.scope
+                )
+
+        resolving.enter(specification)
+        dependencies = []
+        for dependency_argument, dependency_specification in six.iteritems(
+                provider.dependencies):
+            if arguments is not None and dependency_argument in arguments:
+                continue
+            if isinstance(dependency_specification, Factory):
+                dependencies.append(Explanation(
+                    dependency_specification.specification,
+                    Explanation.FACTORY,
+                    argument=dependency_argument
+                ))
+            else:
+                dependencies.append(self._explain(
+                    dependency_specification,
+                    dependency_argument,
+                    None,
+                    providers,
+                    resolving,
+                    scheduled
+                ))
+        resolving.leave(specification)
+        if scope is not None and key is not None:
+            scheduled.add((id(scope), key))
+
+        mean_time = None
+        timing = self._timings.get(specification)
+        if timing is not None:
+            mean_time = timing[1] / timing[0]
+        return Explanation(
+            specification,
+            Explanation.CONSTRUCTED,
+            argument=argument,
+            scope=provider.scope,
+            dependencies=dependencies,
+            mean_time=mean_time
+        )
+
     def get(self, specification, *args, **kwargs):
         """
         A more convenient version of :py:meth:`acquire()` for when you can
@@ -230,22 +1116,96 @@ class Graph(object):
         arguments.update(kwargs)
         return self.acquire(specification, arguments=arguments)
 
+    def getter(self, specification):
+        """
+        Returns a :py:class:`FactoryProxy` for `specification`, which can be
+        called like :py:meth:`get` with the specification already given. It
+        remembers the :term:`provider` and :term:`scope` it found on its
+        first call and what to inject into the provider, so calling it again
+        is faster than calling :py:meth:`get`, until the graph changes::
+
+            get_serializer = graph.getter('serializer')
+            for item in items:
+                output.write(get_serializer(item).dumps())
+        """
+        return self.FactoryProxy(self, specification)
+
     def register_provider(self, specification, provider):
         """
         Registers a :term:`provider` (a :py:class:`wiring.providers.Provider`
         instance) to be called when an object specified by
         :term:`specification` is needed. If there was already a provider for
         this specification it is overriden.
+
+        The change doesn't copy all registered providers, but it costs time
+        proportional to the square root of their number, so
+        :py:meth:`register_providers` should be preferred for registering
+        many providers at once.
         """
-        if provider.scope is not None and provider.scope not in self.scopes:
-            raise UnknownScopeError(provider.scope)
-        self.providers[specification] = provider
+        with self._write_lock:
+            scopes = self.scopes
+            if provider.scope is not None and provider.scope not in scopes:
+                raise UnknownScopeError(provider.scope)
+            providers = self._copy_providers()
+            providers[specification] = provider
+            self._publish_providers(providers)
+            self._changed((specification,))
+
+    def register_providers(self, providers):
+        """
+        Registers multiple :term:`providers <provider>` at once. `providers`
+        is a dictionary mapping :term:`specifications <specification>` to
+        providers, as in :py:meth:`register_provider`. Scopes of all providers
+        are checked before any of them is registered, so when
+        :py:exc:`UnknownScopeError` is raised the graph is left unchanged.
+
+        :raises:
+            :py:exc:`UnknownScopeError`
+        """
+        scope_types = set(
+            provider.scope for provider in six.itervalues(providers)
+        )
+        scope_types.discard(None)
+        with self._write_lock:
+            scopes = self.scopes
+            for scope_type in scope_types:
+                if scope_type not in scopes:
+                    raise UnknownScopeError(scope_type)
+            updated = self._copy_providers()
+            updated.update(providers)
+            self._publish_providers(updated)
+            self._changed(six.iterkeys(providers))
 
     def unregister_provider(self, specification):
         """
         Removes :term:`provider` for given `specification` from the graph.
         """
-        del self.providers[specification]
+        with self._write_lock:
+            providers = self._copy_providers()
+            del providers[specification]
+            self._publish_providers(providers)
+            self._changed((specification,))
+
+    def _copy_providers(self):
+        # Returns a copy of `providers` to be changed and published with
+        # `_publish_providers()`. Copying the whole dictionary on every
+        # registration would make registering providers one by one quadratic,
+        # so changes made in a root graph are kept on top of a shared
+        # dictionary, which is only rebuilt once enough of them accumulate.
+        providers = self.providers
+        if self.parent is None and not isinstance(providers, _Overlay):
+            return _Overlay(providers, None)
+        return _copy_mapping(providers)
+
+    def _publish_providers(self, providers):
+        if self.parent is None:
+            changes = len(providers.local) + len(providers.removed)
+            if changes > max(
+                _MIN_PROVIDER_CHANGES,
+                len(providers.parent) ** 0.5
+            ):
+                providers = _merge_overlay(providers)
+        self.providers = providers
 
     def register_factory(self, specification, factory, scope=None):
         """
@@ -275,20 +1235,276 @@ class Graph(object):
         """
         self.register_provider(specification, InstanceProvider(instance))
 
+    def register_lazy_module(self, module_path, provides):
+        """
+        Registers a :term:`module` class found at `module_path` (in form of
+        ``package.module:ModuleClass``) to be imported, instantiated and added
+        to this graph with :py:meth:`wiring.configuration.Module.add_to` only
+        when one of :term:`specifications <specification>` listed in
+        `provides` is first needed by :py:meth:`acquire` or
+        :py:meth:`validate` and isn't provided by the graph yet.
+
+        For example::
+
+            graph.register_lazy_module(
+                'application.billing:BillingModule',
+                provides=['billing.invoices', 'billing.payments']
+            )
+
+        The module is loaded at most once. If it doesn't provide the needed
+        specification after all, the graph behaves as if it was never
+        provided.
+        """
+        entry = (module_path, tuple(provides))
+        with self._lazy_modules_lock:
+            for specification in entry[1]:
+                self._lazy_modules[specification] = entry
+
+    def _load_lazy_module(self, specification):
+        # Loads a lazy module providing `specification`. Returns `False` if
+        # there is none.
+        with self._lazy_modules_lock:
+            entry = self._lazy_modules.get(specification)
+            if entry is not None:
+                module_lock = self._lazy_module_locks.setdefault(
+                    entry[0],
+                    threading.RLock()
+                )
+        if entry is None:
+            if self.parent is not None:
+                return self.parent._load_lazy_module(specification)
+            # Another thread might have just loaded it.
+            return specification in self.providers
+        module_path, provides = entry
+        with module_lock:
+            with self._lazy_modules_lock:
+                pending = specification in self._lazy_modules
+            if not pending:
+                # Another thread has loaded it while this one was waiting.
+                return True
+            if module_path in self._loading_lazy_modules:
+                # The module needs what it provides while it's being loaded.
+                return specification in self.providers
+            self._loading_lazy_modules.add(module_path)
+            try:
+                _import_object(module_path)().add_to(self)
+            finally:
+                self._loading_lazy_modules.discard(module_path)
+            with self._lazy_modules_lock:
+                for provided in provides:
+                    if (self._lazy_modules.get(provided, (None,))[0] ==
+                            module_path):
+                        del self._lazy_modules[provided]
+                self._lazy_module_locks.pop(module_path, None)
+        return True
+
     def register_scope(self, scope_type, instance):
         """
         Register instance of a :term:`scope` for given scope type. This scope
         may be later referred to by providers using this type.
         """
-        self.scopes[scope_type] = instance
+        with self._write_lock:
+            scopes = _copy_mapping(self.scopes)
+            scopes[scope_type] = instance
+            self.scopes = scopes
 
     def unregister_scope(self, scope_type):
         """
         Removes a :term:`scope` type from the graph.
         """
-        del self.scopes[scope_type]
+        with self._write_lock:
+            scopes = _copy_mapping(self.scopes)
+            del scopes[scope_type]
+            self.scopes = scopes
+
+    def _snapshot(self):
+        # Returns providers of this graph that won't change, even if the graph
+        # or its parents do.
+        providers = self.providers
+        if self.parent is None:
+            if isinstance(providers, _Overlay):
+                # Reading through changes kept by `_copy_providers()` is
+                # slower than reading a dictionary, so they're merged once
+                # the graph is used.
+                merged = _merge_overlay(providers)
+                with self._write_lock:
+                    if self.providers is providers:
+                        self.providers = merged
+                return merged
+            return providers
+        return providers.frozen(self.parent._snapshot())
+
+    def _get_scope(self, specification, scope_type):
+        # Returns a scope instance caching objects for `specification`.
+        if scope_type not in self.scopes:
+            raise UnknownScopeError(scope_type)
+        if self.parent is None or scope_type in self.scopes.local:
+            return self.scopes[scope_type]
+        if specification not in self._get_overridden():
+            return self.parent._get_scope(specification, scope_type)
+        try:
+            return self._isolated_scopes[scope_type]
+        except KeyError:
+            pass
+        inherited = self.parent._get_scope(specification, scope_type)
+        with self._isolated_scopes_lock:
+            if scope_type not in self._isolated_scopes:
+                isolated_scopes = dict(self._isolated_scopes)
+                isolated_scopes[scope_type] = type(inherited)()
+                self._isolated_scopes = isolated_scopes
+            return self._isolated_scopes[scope_type]
+
+    def _get_overridden(self):
+        # Returns a set of specifications overridden in a child graph, along
+        # with all specifications depending on them.
+        revisions, overridden = self._overridden
+        current_revisions = self._revisions()
+        if revisions != current_revisions:
+            self._update_dependants()
+            overridden = frozenset(_walk(
+                list(self.providers.local) + list(self.providers.removed),
+                self._dependants_of
+            ))
+            self._overridden = (current_revisions, overridden)
+        return overridden
+
+    def invalidate(self, specification, transitive=True):
+        """
+        Removes instances cached for `specification` from all registered
+        :term:`scopes <scope>`, so they are created again when needed. When
+        `transitive` is `True`, instances of all specifications that depend on
+        it, directly or not, are removed as well, so they will be recreated
+        with the new object.
+
+        Dependants are found through the same index as used by
+        :py:meth:`validate`, so providers modified directly (without
+        :py:meth:`register_provider`) may not be taken into account.
+
+        A child graph (see :py:meth:`child`) only removes instances from scopes
+        it owns, that is those registered in it and those isolating its
+        overrides, so invalidating in a child never affects its parent.
+
+        Scopes that don't support removing instances with ``del`` are skipped,
+        so objects cached in them aren't invalidated.
+        """
+        if transitive:
+            self._update_dependants()
+            specifications = _walk((specification,), self._dependants_of)
+        else:
+            specifications = (specification,)
+        if self.parent is None:
+            scopes = list(six.itervalues(self.scopes))
+        else:
+            # Inherited scope instances are shared with the parent.
+            scopes = list(six.itervalues(self.scopes.local))
+        scopes.extend(six.itervalues(self._isolated_scopes))
+        scopes = [
+            scope for scope in scopes if hasattr(scope, '__delitem__')
+        ]
+        for invalidated in specifications:
+            with self._argument_keys_lock:
+                references = self._argument_keys.pop(invalidated, {})
+                keys = [invalidated]
+                keys.extend(
+                    reference() for reference in list(references.values())
+                )
+            for key in keys:
+                if key is None:
+                    continue
+                for scope in scopes:
+                    try:
+                        del scope[key]
+                    except KeyError:
+                        pass
+
+    def subgraph(self, roots):
+        """
+        Returns a new graph containing only :term:`providers <provider>` of
+        given `roots` :term:`specifications <specification>` and of all
+        specifications they depend on, directly or not. For example, a worker
+        process needing only ``'worker.main'`` can drop the rest of an
+        application graph::
+
+            graph = application_graph.subgraph(['worker.main'])
+
+        Lazy modules providing any of those specifications are loaded.
+        Specifications that aren't provided are skipped, so that
+        :py:meth:`validate` of the new graph reports them.
+
+        The new graph has the same :term:`scope` types registered, but its own
+        scope instances, created by calling types of this graph's scope
+        instances with no arguments. If this graph has been validated, the new
+        one doesn't need to be.
+        """
+        validated = self._is_validated()
+        providers = self._snapshot()
+        selected = {}
+        pending = list(roots)
+        while pending:
+            specification = pending.pop()
+            if specification in selected:
+                continue
+            if specification not in providers:
+                if self._load_lazy_module(specification):
+                    providers = self._snapshot()
+                if specification not in providers:
+                    # A lazy module may not provide what it claimed to.
+                    validated = False
+                    continue
+            provider = providers[specification]
+            selected[specification] = provider
+            pending.extend(_dependency_specifications(provider))
 
-    def validate(self):
+        subgraph = type(self)()
+        for scope_type, scope in six.iteritems(self.scopes):
+            subgraph.register_scope(scope_type, type(scope)())
+        for scope_type in list(subgraph.scopes):
+            if scope_type not in self.scopes:
+                subgraph.unregister_scope(scope_type)
+        subgraph.register_providers(selected)
+        if validated:
+            subgraph._dirty.clear()
+        return subgraph
+
+    def fingerprint(self):
+        """
+        Returns a string identifying the structure of this graph: its
+        :term:`specifications <specification>`, types of their
+        :term:`providers <provider>` along with provided classes and
+        functions, their :term:`dependencies <dependency>` and :term:`scope`
+        types. It's stable across processes, so graphs configured the same way
+        by different runs of an application have equal fingerprints. Objects
+        provided by :py:class:`wiring.providers.InstanceProvider` are not
+        taken into account.
+
+        Specifications and arguments that aren't classes, functions, their
+        tuples or :term:`categories <category>` are described by their
+        `repr()`, which must not differ between processes for the fingerprint
+        to be stable.
+        """
+        lines = []
+        for specification, provider in six.iteritems(self._snapshot()):
+            provided = getattr(
+                provider,
+                'factory',
+                getattr(provider, 'function', None)
+            )
+            lines.append(' '.join((
+                _describe(specification),
+                _describe(type(provider)),
+                _describe(provided),
+                _describe(provider.scope),
+                repr(sorted(
+                    (_describe(argument), _describe(dependency))
+                    for argument, dependency in six.iteritems(
+                        provider.dependencies
+                    )
+                )),
+            )))
+        lines.sort()
+        return hashlib.sha1('\n'.join(lines).encode('utf-8')).hexdigest()
+
+    def validate(self, full=False, roots=None, cache=None):
         """
         Asserts that every declared :term:`specification` can actually be
         realized, meaning that all of its :term:`dependencies <dependency>` are
@@ -296,61 +1512,545 @@ class Graph(object):
         <dependency cycle>`. If such a problem is found, a proper exception
         (deriving from :py:class:`GraphValidationError`) is raised.
 
+        Only specifications affected by changes made with
+        :py:meth:`register_provider` and :py:meth:`unregister_provider` (or
+        methods using them) since the last successful validation are checked.
+        If `full` is `True` the whole graph is checked, which is needed after
+        :py:attr:`providers` or provider :term:`dependencies <dependency>`
+        were modified directly.
+
+        When `roots` is given, only those specifications and specifications
+        they depend on, directly or not, are checked, regardless of changes
+        made since the last validation. `KeyError` is raised if one of `roots`
+        isn't provided.
+
+        `cache` may be a path of a file storing :py:meth:`fingerprint` of
+        every graph that was successfully validated with it. If the file
+        contains the fingerprint of this graph, it's considered valid without
+        any check. Otherwise the graph is validated and its fingerprint is
+        added to the file. Failures to read or write the file are ignored.
+        The cache is not used when `roots` are given.
+
         :raises:
             :py:exc:`MissingDependencyError`,
             :py:exc:`SelfDependencyError`,
-            :py:exc:`DependencyCycleError`
+            :py:exc:`DependencyCycleError`,
+            KeyError
         """
-        # This method uses Tarjan's strongly connected components algorithm
-        # with added self-dependency check to find dependency cyclces.
+        if roots is not None:
+            roots = list(roots)
+            providers = self._snapshot()
+            for root in roots:
+                if root not in providers:
+                    if not self._load_lazy_module(root):
+                        raise KeyError(root)
+                    providers = self._snapshot()
+            self._check(providers, roots)
+            return
+        if cache is not None:
+            with self._write_lock:
+                revisions = self._revisions()
+            fingerprint = self.fingerprint()
+            if fingerprint in _read_fingerprints(cache):
+                with self._write_lock:
+                    if self._revisions() == revisions:
+                        self._dirty.clear()
+                        self._validated_parents = revisions[1:]
+                        return
+            self.validate(full=full)
+            if self._revisions() == revisions:
+                _store_fingerprint(cache, fingerprint)
+            return
+        while True:
+            with self._write_lock:
+                parents = self._revisions()[1:]
+                dirty, self._dirty = self._dirty, collections.OrderedDict()
+                providers = self._snapshot()
+            if parents != self._validated_parents:
+                # One of parent graphs has changed since the last validation.
+                full = True
+            if not full and len(dirty) >= len(providers):
+                # Checking affected specifications is pointless when all of
+                # them have changed, as it happens on the first validation.
+                full = all(
+                    specification in dirty for specification in providers
+                )
+            try:
+                if full:
+                    self._check(providers, list(providers))
+                else:
+                    self._check(providers, *self._affected(providers, dirty))
+            except Exception:
+                with self._write_lock:
+                    self._dirty.update(dirty)
+                raise
+            self._validated_parents = parents
+            if not self._dirty:
+                break
+            # Lazy modules were loaded during the check, so their providers
+            # need to be checked as well.
+            full = False
+
+    def _changed(self, specifications):
+        for specification in specifications:
+            self._dirty[specification] = None
+            self._unindexed.add(specification)
+            self._plans.pop(specification, None)
+            self._unindexed_implementers.add(specification)
+        self._revision += 1
+
+    def _revisions(self):
+        # Returns revisions of this graph and all its parents.
+        if self.parent is None:
+            return (self._revision,)
+        return (self._revision,) + self.parent._revisions()
+
+    def _is_validated(self):
+        return (
+            not self._dirty and
+            self._validated_parents == self._revisions()[1:]
+        )
+
+    def _dependants_of(self, specification):
+        # Returns specifications directly depending on `specification`,
+        # including those inherited from parent graphs. For child graphs the
+        # result may include some that don't depend on it anymore.
+        dependants = self._dependants.get(specification, ())
+        if self.parent is None:
+            return dependants
+        inherited = self.parent._dependants_of(specification)
+        if not dependants:
+            return inherited
+        return set(dependants).union(inherited)
+
+    def _implementers_of(self, interface):
+        # Returns specifications indexed as provided by classes implementing
+        # `interface`, including those inherited from parent graphs.
+        with self._write_lock:
+            self._update_own_implementers()
+            implementers = frozenset(self._implementers.get(interface, ()))
+        if self.parent is None:
+            return implementers
+        return implementers.union(self.parent._implementers_of(interface))
 
-        # Index is just an integer, it's wrapped in a list as a workaround for
-        # Python 2's lack of `nonlocal` keyword, so the nested
-        # `strongconnect()` may modify it.
-        index = [0]
+    def _update_own_implementers(self):
+        providers = self.providers
+        for specification in self._unindexed_implementers:
+            for interface in self._implemented.pop(specification, ()):
+                implementers = self._implementers[interface]
+                implementers.discard(specification)
+                if not implementers:
+                    del self._implementers[interface]
+            if specification not in providers:
+                continue
+            interfaces = _implemented_interfaces(providers[specification])
+            for interface in interfaces:
+                self._implementers.setdefault(interface, set()).add(
+                    specification
+                )
+            if interfaces:
+                self._implemented[specification] = interfaces
+        self._unindexed_implementers.clear()
+
+    def _update_dependants(self):
+        if self.parent is not None:
+            self.parent._update_dependants()
+        with self._write_lock:
+            self._update_own_dependants()
+
+    def _update_own_dependants(self):
+        providers = self.providers
+        for specification in self._unindexed:
+            for dependency in self._indexed.pop(specification, ()):
+                dependants = self._dependants[dependency]
+                dependants.discard(specification)
+                if not dependants:
+                    del self._dependants[dependency]
+            if specification not in providers:
+                continue
+            dependencies = frozenset(
+                _dependency_specifications(providers[specification])
+            )
+            for dependency in dependencies:
+                self._dependants.setdefault(dependency, set()).add(
+                    specification
+                )
+            self._indexed[specification] = dependencies
+        self._unindexed.clear()
+
+    def _affected(self, providers, dirty):
+        # Returns specifications that need to be checked after `dirty` ones
+        # were changed and a set of specifications to which the check can be
+        # limited (or `None` if it can't).
+        self._update_dependants()
+        roots = collections.OrderedDict()
+        for specification in dirty:
+            if specification in providers:
+                roots[specification] = None
+            else:
+                # Dependants of a removed specification are now missing
+                # a dependency.
+                for dependant in self._dependants_of(specification):
+                    if dependant in providers:
+                        roots[dependant] = None
+
+        # Only specifications that are both reachable from the changed ones
+        # and reaching them may form a new cycle. Both sets are explored at
+        # once and whichever is complete first limits the check.
+        def dependencies(specification):
+            return (
+                dependency
+                for dependency in _dependency_specifications(
+                    providers[specification]
+                )
+                if dependency in providers
+            )
 
+        forward = _walk(roots, dependencies)
+        backward = _walk(roots, self._dependants_of)
+        reaching = set()
+        while True:
+            try:
+                next(forward)
+            except StopIteration:
+                return roots, None
+            try:
+                reaching.add(next(backward))
+            except StopIteration:
+                return roots, reaching
+
+    def _check(self, providers, roots, allowed=None):
+        # This method uses an iterative version of Tarjan's strongly connected
+        # components algorithm with added self-dependency check to find
+        # dependency cycles. Recursion is replaced with an explicit stack of
+        # visited specifications and iterators over their remaining
+        # dependencies, so deep graphs don't hit the recursion limit. When
+        # `allowed` is given, the search doesn't descend into specifications
+        # outside of it.
+        index = 0
         indices = {}
         lowlinks = {}
         stack = []
+        on_stack = set()
 
-        def strongconnect(specification):
-            # Set the depth index for the node to the smallest unused index.
-            indices[specification] = index[0]
-            lowlinks[specification] = index[0]
-            index[0] += 1
-            stack.append(specification)
-            provider = self.providers[specification]
-            dependencies = six.itervalues(provider.dependencies)
-            for dependency in dependencies:
-                if isinstance(dependency, Factory):
-                    dependency = dependency.specification
-                if dependency not in self.providers:
-                    raise MissingDependencyError(specification, dependency)
-                if dependency == specification:
-                    raise SelfDependencyError(specification)
-                if dependency not in indices:
-                    # Dependency has not yet been visited; recurse on it.
-                    strongconnect(dependency)
-                    lowlinks[specification] = min(
-                        lowlinks[specification],
-                        lowlinks[dependency]
-                    )
-                elif dependency in stack:
-                    # Dependency is in stack and hence in the current strongly
-                    # connected component.
-                    lowlinks[specification] = min(
-                        lowlinks[specification],
-                        indices[dependency]
-                    )
-            if lowlinks[specification] == indices[specification]:
-                component = []
-                while True:
-                    component.append(stack.pop())
-                    if component[-1] == specification:
+        for root in roots:
+            if root in indices:
+                continue
+            indices[root] = lowlinks[root] = index
+            index += 1
+            stack.append(root)
+            on_stack.add(root)
+            visiting = [
+                (root, _dependency_specifications(providers[root])),
+            ]
+            while visiting:
+                specification, dependencies = visiting[-1]
+                for dependency in dependencies:
+                    if (dependency not in providers and
+                            self._load_lazy_module(dependency)):
+                        providers = self._snapshot()
+                    if dependency not in providers:
+                        raise MissingDependencyError(specification, dependency)
+                    if dependency == specification:
+                        raise SelfDependencyError(specification)
+                    if dependency not in indices:
+                        if allowed is not None and dependency not in allowed:
+                            continue
+                        # Dependency has not yet been visited; descend into it
+                        # and resume with remaining dependencies afterwards.
+                        indices[dependency] = lowlinks[dependency] = index
+                        index += 1
+                        stack.append(dependency)
+                        on_stack.add(dependency)
+                        visiting.append((
+                            dependency,
+                            _dependency_specifications(providers[dependency])
+                        ))
                         break
-                if len(component) > 1:
-                    raise DependencyCycleError(reversed(component))
+                    elif dependency in on_stack:
+                        # Dependency is in stack and hence in the current
+                        # strongly connected component.
+                        lowlinks[specification] = min(
+                            lowlinks[specification],
+                            indices[dependency]
+                        )
+                else:
+                    # All dependencies were visited.
+                    visiting.pop()
+                    if visiting:
+                        dependant = visiting[-1][0]
+                        lowlinks[dependant] = min(
+                            lowlinks[dependant],
+                            lowlinks[specification]
+                        )
+                    if lowlinks[specification] == indices[specification]:
+                        component = []
+                        while True:
+                            component.append(stack.pop())
+                            on_stack.discard(component[-1])
+                            if component[-1] == specification:
+                                break
+                        if len(component) > 1:
+                            raise DependencyCycleError(reversed(component))
+
+
+_MIN_PROVIDER_CHANGES = 32
+"""
+Number of changes to providers of a root graph kept on top of a shared
+dictionary before it's rebuilt, unless the square root of its size is greater.
+"""
+
+
+class _Resolving(object):
+    # Specifications whose dependencies are being acquired, kept both in
+    # a set for checking for cycles and in a list for reporting them.
+
+    __slots__ = ('members', 'stack')
+
+    def __init__(self):
+        self.members = set()
+        self.stack = []
+
+    def enter(self, specification):
+        if specification in self.members:
+            raise DependencyCycleError(
+                self.stack[self.stack.index(specification):]
+            )
+        self.members.add(specification)
+        self.stack.append(specification)
+
+    def leave(self, specification):
+        self.members.discard(specification)
+        self.stack.pop()
+
+
+class _ArgumentsKey(object):
+    # Key of an object acquired with arguments in a scope.
+
+    __slots__ = ('specification', 'arguments', '_hash', '__weakref__')
+
+    def __init__(self, specification, arguments):
+        self.specification = specification
+        self.arguments = arguments
+        self._hash = hash((specification, arguments))
+
+    @classmethod
+    def create(cls, specification, arguments):
+        # Returns a key for given specification and dictionary of arguments,
+        # or `None` if they aren't hashable.
+        try:
+            return cls(specification, frozenset(six.iteritems(arguments)))
+        except TypeError:
+            return None
+
+    def __eq__(self, other):
+        return (
+            type(other) is _ArgumentsKey and
+            self.specification == other.specification and
+            self.arguments == other.arguments
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return self._hash
+
+
+def _forget_key(keys, identity, reference):
+    # Called when a key of an object cached with arguments is garbage
+    # collected. Another key might have been remembered under the same
+    # identity since.
+    if keys.get(identity) is reference:
+        keys.pop(identity, None)
+
+
+class _Plan(object):
+    # Dependencies of a provider arranged for building call arguments.
+
+    __slots__ = ('provider', 'dependencies', 'scope', 'positional', 'injected')
+
+    def __init__(self, provider, dependencies):
+        self.provider = provider
+        self.dependencies = dependencies
+        self.scope = provider.scope
+        self.positional = 0
+        # Tuples of arguments, specifications of dependencies injected as
+        # them and whether a factory proxy should be injected.
+        injected = []
+        for argument, specification in six.iteritems(dependencies):
+            if isinstance(argument, six.integer_types):
+                self.positional = max(self.positional, argument + 1)
+            elif not isinstance(argument, six.string_types):
+                raise TypeError(
+                    "{} is not a valid argument key".format(repr(argument))
+                )
+            if isinstance(specification, Factory):
+                injected.append((argument, specification.specification, True))
+            else:
+                injected.append((argument, specification, False))
+        self.injected = tuple(injected)
+
+
+class _Overlay(MutableMapping):
+    # A mapping storing changes made on top of an attribute of another object,
+    # used by child graphs for providers and scopes. Keys deleted in the
+    # overlay are hidden, even if they are present in the parent mapping.
+
+    # When `attribute` is `None`, `parent` is the underlying mapping itself.
+
+    def __init__(self, parent, attribute, local=None, removed=None):
+        self.parent = parent
+        self.attribute = attribute
+        self.local = {} if local is None else local
+        self.removed = set() if removed is None else removed
+
+    def copy(self):
+        return _Overlay(
+            self.parent,
+            self.attribute,
+            dict(self.local),
+            set(self.removed)
+        )
+
+    def frozen(self, mapping):
+        # Returns an overlay sharing changes with this one, but on top of
+        # given mapping instead of parent's attribute. Changes must not be
+        # modified in place afterwards.
+        return _Overlay(mapping, None, self.local, self.removed)
+
+    def _mapping(self):
+        if self.attribute is None:
+            return self.parent
+        return getattr(self.parent, self.attribute)
+
+    def __getitem__(self, key):
+        try:
+            return self.local[key]
+        except KeyError:
+            if key in self.removed:
+                raise
+            return self._mapping()[key]
+
+    def __contains__(self, key):
+        if key in self.local:
+            return True
+        return key not in self.removed and key in self._mapping()
+
+    def __setitem__(self, key, value):
+        self.local[key] = value
+        self.removed.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.local.pop(key, None)
+        if key in self._mapping():
+            self.removed.add(key)
+
+    def __iter__(self):
+        for key in self.local:
+            yield key
+        for key in self._mapping():
+            if key not in self.local and key not in self.removed:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def _describe(value):
+    # Returns a description of a specification, provided object or scope type
+    # that doesn't differ between processes, unless its `repr()` does.
+    if inspect.isclass(value) or inspect.isroutine(value):
+        function = getattr(value, '__func__', value)
+        return '{}:{}'.format(
+            getattr(function, '__module__', None),
+            getattr(function, '__qualname__', function.__name__)
+        )
+    if isinstance(value, tuple):
+        described = ', '.join(_describe(element) for element in value)
+        if type(value) is tuple:
+            return '({})'.format(described)
+        return '{}({})'.format(_describe(type(value)), described)
+    return repr(value)
+
+
+def _read_fingerprints(path):
+    try:
+        with open(path) as cache:
+            return set(line.strip() for line in cache)
+    except (IOError, OSError):
+        return set()
+
+
+def _store_fingerprint(path, fingerprint):
+    try:
+        with open(path, 'a') as cache:
+            cache.write(fingerprint + '\n')
+    except (IOError, OSError):
+        pass
+
+
+def _apply_arguments(args, kwargs, arguments):
+    # Puts explicitly given arguments into lists of positional and keyword
+    # arguments.
+    for argument, value in six.iteritems(arguments):
+        if isinstance(argument, six.integer_types):
+            # Integer keys are for positional arguments.
+            if len(args) <= argument:
+                args.extend([None] * (argument + 1 - len(args)))
+            args[argument] = value
+        elif isinstance(argument, six.string_types):
+            # String keys are for keyword arguments.
+            kwargs[argument] = value
+        else:
+            raise TypeError(
+                "{} is not a valid argument key".format(repr(argument))
+            )
+
+
+def _merge_overlay(overlay):
+    # Returns a dictionary with contents of an overlay on top of a mapping.
+    merged = dict(overlay._mapping())
+    merged.update(overlay.local)
+    for key in overlay.removed:
+        merged.pop(key, None)
+    return merged
+
+
+def _copy_mapping(mapping):
+    # Returns a shallow copy of `providers` or `scopes` of a graph.
+    if isinstance(mapping, _Overlay):
+        return mapping.copy()
+    return dict(mapping)
+
+
+def _dependency_specifications(provider):
+    # Yields specifications of provider's dependencies, unwrapping factories.
+    for dependency in six.itervalues(provider.dependencies):
+        if isinstance(dependency, Factory):
+            yield dependency.specification
+        else:
+            yield dependency
+
+
+def _implemented_interfaces(provider):
+    # Returns interfaces implemented by the class created by `provider`.
+    factory = getattr(provider, 'factory', None)
+    if not inspect.isclass(factory):
+        return frozenset()
+    return get_implemented_interfaces(factory)
+
 
-        for specification, provider in six.iteritems(self.providers):
-            if specification not in indices:
-                strongconnect(specification)
+def _walk(roots, edges):
+    # Yields all nodes reachable from `roots` through `edges`.
+    visited = set(roots)
+    queue = list(roots)
+    while queue:
+        node = queue.pop()
+        yield node
+        for other in edges(node):
+            if other not in visited:
+                visited.add(other)
+                queue.append(other)
@@ -0,0 +1,179 @@
+"""
+This module provides :py:class:`GraphHandle`, which allows replacing an
+:term:`object graph` used by a running application, for example to reload its
+configuration, without interrupting requests being handled.
+"""
+
+import contextlib
+import threading
+
+import six
+
+
+__all__ = (
+    'GraphHandle',
+)
+
+
+class GraphHandle(object):
+    """
+    Serves objects from the current :term:`object graph`, which can be
+    atomically replaced with another one using :py:meth:`swap` or
+    :py:meth:`reload`.
+
+    Code handling a single request should use one graph for all objects it
+    needs, so it should acquire them within a :py:meth:`using` block::
+
+        with handle.using() as graph:
+            database = graph.get(Database)
+            ...
+
+    After the graph is replaced, instances cached by :term:`scopes <scope>` of
+    the previous graph which aren't used by the new one are closed once all
+    requests still using the previous graph finish. Closing means removing
+    them from scopes with their ``clear()`` method (which all built-in scopes
+    have) and calling `close` with each of them. By default their ``close()``
+    method is called, if they have one.
+    """
+
+    def __init__(self, graph, close=None):
+        self._current = _Generation(graph)
+        self._lock = threading.Lock()
+        self._swap_lock = threading.Lock()
+        self._close = _close_instance if close is None else close
+
+    @property
+    def graph(self):
+        """
+        The :term:`object graph` currently in use.
+        """
+        return self._current.graph
+
+    @contextlib.contextmanager
+    def using(self):
+        """
+        Returns a context manager yielding the current :term:`object graph`
+        and preventing its scoped instances from being closed before the
+        block is left, even if the graph is replaced in the meantime.
+        """
+        with self._lock:
+            generation = self._current
+            generation.users += 1
+        try:
+            yield generation.graph
+        finally:
+            self._leave(generation)
+
+    def acquire(self, specification, arguments=None):
+        """
+        Acquires an object from the current :term:`object graph`. See
+        :py:meth:`wiring.graph.Graph.acquire`.
+        """
+        with self.using() as graph:
+            return graph.acquire(specification, arguments=arguments)
+
+    def get(self, specification, *args, **kwargs):
+        """
+        Gets an object from the current :term:`object graph`. See
+        :py:meth:`wiring.graph.Graph.get`.
+        """
+        with self.using() as graph:
+            return graph.get(specification, *args, **kwargs)
+
+    def swap(self, graph, warm=()):
+        """
+        Validates `graph`, acquires objects for all :term:`specifications
+        <specification>` listed in `warm` from it, so that scoped instances
+        are ready before it's used, and then makes it the current graph.
+        If validation or warming fails, the exception is propagated and the
+        current graph stays in use.
+
+        Scoped instances of the replaced graph are closed right away if it's
+        not in use, or when the last request using it finishes otherwise.
+        Exceptions raised while closing them are propagated from the place
+        where that happens.
+
+        Returns the replaced graph.
+        """
+        graph.validate()
+        for specification in warm:
+            graph.acquire(specification)
+        with self._swap_lock:
+            new = _Generation(graph)
+            with self._lock:
+                old, self._current = self._current, new
+                old.successor = new
+            self._leave(old, entered=False)
+        return old.graph
+
+    def reload(self, build, warm=()):
+        """
+        Calls `build` in a new thread to create a new :term:`object graph`,
+        which is then validated, warmed up and made current with
+        :py:meth:`swap`, while requests are still served with the current
+        graph.
+
+        Returns the started thread. After it's joined, its `graph` attribute
+        holds the new graph and its `error` attribute holds an exception that
+        prevented the swap, or `None` if there was none.
+        """
+        def run():
+            try:
+                thread.graph = build()
+                self.swap(thread.graph, warm=warm)
+            except Exception as error:
+                thread.error = error
+
+        thread = threading.Thread(target=run, name='wiring-reload')
+        thread.graph = None
+        thread.error = None
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _leave(self, generation, entered=True):
+        with self._lock:
+            if entered:
+                generation.users -= 1
+            if (generation.successor is None or generation.users or
+                    generation.closed):
+                return
+            generation.closed = True
+        kept = _scope_identities(generation.successor.graph)
+        for scope in six.itervalues(_scope_identities(generation.graph)):
+            if id(scope) in kept:
+                continue
+            clear = getattr(scope, 'clear', None)
+            if clear is None:
+                continue
+            for instance in clear():
+                self._close(instance)
+
+
+class _Generation(object):
+
+    def __init__(self, graph):
+        self.graph = graph
+        # Number of requests using the graph.
+        self.users = 0
+        # Generation that replaced this one, if any.
+        self.successor = None
+        self.closed = False
+
+
+def _scope_identities(graph):
+    # Returns scope instances owned or used by a graph, keyed by identity.
+    scopes = {}
+    while graph is not None:
+        for scope in six.itervalues(graph.scopes):
+            scopes[id(scope)] = scope
+        for scope in six.itervalues(graph._isolated_scopes):
+            scopes[id(scope)] = scope
+        graph = graph.parent
+    return scopes
+
+
+def _close_instance(instance):
+    close = getattr(instance, 'close', None)
+    if callable(close):
+        close()
@@ -1,6 +1,7 @@
-import collections
 import inspect
+import itertools
 import operator
+import weakref
 
 import six
 
@@ -162,8 +163,13 @@ class InterfaceMetaclass(type):
     It also collects (and stores in `implied` attribute) a set of this and all
     base interfaces, as it never changes after the class is declared and is
     very commonly needed.
+
+    Every interface class is also given a unique `bit`, so that sets of
+    interfaces can be represented as integer masks.
     """
 
+    _bit_indexes = itertools.count()
+
     def __new__(cls, interface_name, bases, attributes):
         ignored_attribute_names = (
             '__module__',
@@ -198,6 +204,7 @@ class InterfaceMetaclass(type):
             ancestor for ancestor in inspect.getmro(interface)
             if cls._is_interface_class(ancestor)
         ))
+        interface.bit = 1 << next(cls._bit_indexes)
 
         interface.attributes = {}
 
@@ -247,6 +254,12 @@ class Interface(object):
     A `frozenset` of this and all base :term:`interfaces <interface>`.
     """
 
+    bit = 0
+    """
+    An integer with a single bit set, different for every :term:`interface`.
+    Masks of interfaces implemented by classes are built from those.
+    """
+
     attributes = {}
     """
     Dictionary describing provided attributes, including methods. Keys are
@@ -264,6 +277,13 @@ class Interface(object):
         `instance`'s class doesn't have to declare it implements an interface
         to be validated against it.
 
+        Once an instance passes the check, attributes defined by its class
+        aren't checked again for other instances of the class, as long as
+        the class and its bases keep the same objects under those attributes.
+        Only attributes the class doesn't define or the instance overrides are
+        checked on every instance, as well as data descriptors (like
+        properties and slots), whose values depend on the instance.
+
         .. note::
             Classes cannot be validated against an interface, because instance
             attributes couldn't be checked.
@@ -277,11 +297,95 @@ class Interface(object):
                 "Only instances, not classes, can be validated against an"
                 " interface."
             )
-        for name, value in six.iteritems(cls.attributes):
+        instance_class = instance.__class__
+        names = tuple(cls.attributes)
+        class_attributes = _get_class_attributes(instance_class, names)
+        try:
+            verdicts = _compliance_cache[instance_class]
+        except KeyError:
+            verdicts = {}
+        checked = verdicts.get(cls)
+        if (checked is not None and
+                _same_attributes(checked, class_attributes)):
+            instance_attributes = getattr(instance, '__dict__', {})
+            names = tuple(
+                name
+                for name, token in zip(names, checked)
+                if token is _MISSING or name in instance_attributes
+            )
+        else:
+            checked = None
+        for name in names:
             if not hasattr(instance, name):
                 raise MissingAttributeError(name)
+            value = cls.attributes[name]
             if isinstance(value, Method):
                 value.check_compliance(getattr(instance, name))
+        if checked is None:
+            verdicts = _compliance_cache.setdefault(instance_class, {})
+            verdicts[cls] = tuple(
+                _get_token(attribute, cls.attributes[name])
+                for name, attribute in zip(names, class_attributes)
+            )
+
+
+# Maps classes to dictionaries mapping interfaces their instances were found to
+# comply with to tokens of objects found under interface attributes in the
+# class at the time, as returned by `_get_token`.
+_compliance_cache = weakref.WeakKeyDictionary()
+
+_MISSING = object()
+
+_PRESENT = object()
+
+
+def _get_class_attributes(cls, names):
+    # Returns a tuple of objects stored in `cls` or its bases under given
+    # attribute names, with `_MISSING` for those that aren't found or are data
+    # descriptors, and so have to be checked on each instance.
+    namespaces = [vars(base) for base in inspect.getmro(cls)]
+    attributes = []
+    for name in names:
+        for namespace in namespaces:
+            if name in namespace:
+                attribute = namespace[name]
+                if inspect.isdatadescriptor(attribute):
+                    attribute = _MISSING
+                attributes.append(attribute)
+                break
+        else:
+            attributes.append(_MISSING)
+    return tuple(attributes)
+
+
+def _get_token(attribute, specification):
+    # Returns a token representing a class attribute in the compliance cache.
+    # Objects are referenced weakly, as methods using `super()` reference the
+    # class, which would then never be collected. Objects that can't be weakly
+    # referenced are represented by `_PRESENT`, unless they're expected to be
+    # methods, whose signatures matter. Those are represented by `_MISSING`,
+    # so they're checked on each instance, like attributes that aren't found.
+    if attribute is _MISSING:
+        return _MISSING
+    try:
+        return weakref.ref(attribute)
+    except TypeError:
+        if isinstance(specification, Method):
+            return _MISSING
+        return _PRESENT
+
+
+def _same_attributes(tokens, attributes):
+    # Checks if class attributes are still those represented by tokens.
+    if len(tokens) != len(attributes):
+        return False
+    for token, attribute in zip(tokens, attributes):
+        if token is _PRESENT or token is _MISSING:
+            if (attribute is _MISSING) != (token is _MISSING):
+                return False
+        elif token() is not attribute:
+            return False
+    return True
 
 
 def get_implemented_interfaces(cls):
@@ -289,16 +393,9 @@ def get_implemented_interfaces(cls):
     Returns a set of :term:`interfaces <interface>` declared as implemented by
     class `cls`.
     """
-    if hasattr(cls, '__interfaces__'):
-        return cls.__interfaces__
-    return six.moves.reduce(
-        lambda x, y: x.union(y),
-        map(
-            get_implemented_interfaces,
-            inspect.getmro(cls)[1:]
-        ),
-        set()
-    )
+    # Declarations are inherited like any other class attribute, so when
+    # neither the class nor its bases declare any, nothing is implemented.
+    return getattr(cls, '__interfaces__', _NO_INTERFACES)
 
 
 def set_implemented_interfaces(cls, interfaces):
@@ -306,15 +403,12 @@ def set_implemented_interfaces(cls, interfaces):
     Declares :term:`interfaces <interface>` as implemented by class `cls`.
     Those already declared are overriden.
     """
-    setattr(
+    _set_interfaces(
         cls,
-        '__interfaces__',
-        frozenset(
-            six.moves.reduce(
-                lambda x, y: x.union(y),
-                map(operator.attrgetter('implied'), interfaces),
-                set()
-            )
+        six.moves.reduce(
+            lambda x, y: x.union(y),
+            map(operator.attrgetter('implied'), interfaces),
+            set()
         )
     )
 
@@ -335,7 +429,23 @@ def add_implemented_interfaces(cls, interfaces):
         get_implemented_interfaces,
         inspect.getmro(cls)
     ))
-    setattr(cls, '__interfaces__', frozenset(implemented))
+    _set_interfaces(cls, implemented)
+
+
+def _set_interfaces(cls, interfaces):
+    # Mask of the interfaces is stored next to them, so that
+    # `isimplementation` doesn't have to look at the set.
+    interfaces = frozenset(interfaces)
+    setattr(cls, '__interfaces__', interfaces)
+    setattr(
+        cls,
+        '__interfaces_mask__',
+        six.moves.reduce(
+            operator.or_,
+            map(operator.attrgetter('bit'), interfaces),
+            0
+        )
+    )
 
 
 def implements(*interfaces):
@@ -370,12 +480,24 @@ def isimplementation(obj, interfaces):
     interface classes.
     """
     if not inspect.isclass(obj):
-        isimplementation(obj.__class__, interfaces)
-    if not isinstance(interfaces, collections.Iterable):
-        interfaces = [interfaces]
-    return frozenset(interfaces).issubset(
-        get_implemented_interfaces(obj)
-    )
+        obj = obj.__class__
+    implemented = getattr(obj, '__interfaces_mask__', 0)
+    if isinstance(interfaces, InterfaceMetaclass):
+        return (implemented & interfaces.bit) == interfaces.bit
+    try:
+        interfaces = iter(interfaces)
+    except TypeError:
+        # Not an interface, so it can't be implemented.
+        return False
+    required = 0
+    for interface in interfaces:
+        if not isinstance(interface, InterfaceMetaclass):
+            return False
+        required |= interface.bit
+    return (implemented & required) == required
+
+
+_NO_INTERFACES = frozenset()
 
 
 if six.PY3:
@@ -0,0 +1,246 @@
+"""
+This module can record all :term:`providers <provider>` registered by
+a :term:`module` into a manifest file, so they can later be restored into an
+:term:`object graph` without importing and instantiating the module, scanning
+or inspecting provider dependencies.
+
+A manifest is built from the command line by giving a path to a module class::
+
+    python -m wiring.manifest build myapp.module:ApplicationModule \\
+        --output myapp.manifest
+
+and then loaded at startup::
+
+    graph = Graph.from_manifest('myapp.manifest')
+
+Along with providers, a manifest records hashes of source files of all Python
+modules defining the module class, :term:`specifications <specification>`,
+provided callables and their base classes. When any of those files changes,
+or the manifest cannot be read back, it is considered stale and the module
+class is imported and added to the graph the usual way instead.
+
+Providers are stored using :py:mod:`pickle`, so all :term:`specifications
+<specification>`, provided callables and scope types must be picklable, which
+usually means they must be defined at module level.
+"""
+
+import argparse
+import hashlib
+import inspect
+import pickle
+import sys
+
+import six
+
+from wiring.configuration import _import_object
+from wiring.graph import Graph
+
+
+__all__ = (
+    'ManifestError',
+    'build_manifest',
+    'load_manifest',
+)
+
+
+MANIFEST_FORMAT = 1
+"""Version of the manifest file format."""
+
+PICKLE_PROTOCOL = 2
+"""
+Pickle protocol used for manifests. It is the highest one supported by all
+Python versions Wiring runs on.
+"""
+
+
+class ManifestError(Exception):
+    """
+    Raised when a manifest cannot be built or read.
+    """
+
+    def __init__(self, message):
+        self.message = message
+        """A message describing the problem."""
+
+    def __str__(self):
+        return self.message
+
+
+def build_manifest(module_path, output):
+    """
+    Instantiates a :term:`module` class found at `module_path` (in form of
+    ``package.module:ModuleClass``), registers its providers into an empty
+    :term:`object graph` and saves them along with their :term:`dependencies
+    <dependency>` into a manifest file named `output`.
+
+    :raises:
+        :py:exc:`ManifestError`
+    """
+    module_class = _import_object(module_path)
+    graph = Graph()
+    module_class().add_to(graph)
+
+    python_modules = set(_defining_modules(module_class))
+    for specification, provider in six.iteritems(graph.providers):
+        python_modules.update(_defining_modules(specification))
+        python_modules.update(_defining_modules(provider))
+        # Make sure dependencies get stored instead of being inspected after
+        # loading.
+        for dependency in six.itervalues(provider.dependencies):
+            python_modules.update(_defining_modules(dependency))
+        for attribute in ('factory', 'function', 'instance'):
+            if hasattr(provider, attribute):
+                python_modules.update(
+                    _defining_modules(getattr(provider, attribute))
+                )
+
+    header = {
+        'format': MANIFEST_FORMAT,
+        'python': tuple(sys.version_info[:2]),
+        'module': module_path,
+        'sources': _hash_sources(python_modules),
+    }
+    try:
+        providers = pickle.dumps(dict(graph.providers), PICKLE_PROTOCOL)
+    except Exception:
+        for specification, provider in six.iteritems(graph.providers):
+            try:
+                pickle.dumps((specification, provider), PICKLE_PROTOCOL)
+            except Exception as error:
+                raise ManifestError(
+                    "Cannot store provider for {spec}: {error}".format(
+                        spec=repr(specification),
+                        error=error
+                    )
+                )
+        raise
+    with open(output, 'wb') as manifest:
+        pickle.dump(header, manifest, PICKLE_PROTOCOL)
+        manifest.write(providers)
+
+
+def load_manifest(path, graph):
+    """
+    Registers :term:`providers <provider>` saved in a manifest file under
+    `path` into `graph`. If any of the recorded source files have changed
+    since the manifest was built, the recorded :term:`module` class is
+    imported and added to the graph instead.
+
+    Returns `True` if providers were restored from the manifest and `False` if
+    it was stale.
+
+    :raises:
+        :py:exc:`ManifestError`
+    """
+    with open(path, 'rb') as manifest:
+        try:
+            header = pickle.load(manifest)
+            module_path = header['module']
+        except Exception as error:
+            raise ManifestError(
+                "Cannot read manifest {path}: {error}".format(
+                    path=path,
+                    error=error
+                )
+            )
+        if (header.get('format') != MANIFEST_FORMAT or
+                header.get('python') != tuple(sys.version_info[:2]) or
+                not _check_sources(header.get('sources', {}))):
+            _import_object(module_path)().add_to(graph)
+            return False
+        # Sources are unchanged, so importing provided objects is safe.
+        try:
+            providers = pickle.load(manifest)
+        except Exception:
+            # Something the manifest refers to has changed in a way not
+            # covered by recorded sources.
+            providers = None
+    if providers is None:
+        _import_object(module_path)().add_to(graph)
+        return False
+    graph.register_providers(providers)
+    return True
+
+
+def _defining_modules(value):
+    # Yields names of Python modules whose sources may affect `value`, which
+    # is a specification, a provider or a provided object. For classes, bases
+    # are included, as they may define injected constructors.
+    if isinstance(value, tuple):
+        for element in value:
+            for name in _defining_modules(element):
+                yield name
+    if not inspect.isclass(value):
+        name = getattr(value, '__module__', None)
+        if isinstance(name, six.string_types):
+            yield name
+        value = type(value)
+    for ancestor in inspect.getmro(value):
+        yield ancestor.__module__
+
+
+def _hash_sources(python_modules):
+    sources = {}
+    for name in python_modules:
+        python_module = sys.modules.get(name)
+        if python_module is None:
+            continue
+        try:
+            path = inspect.getsourcefile(python_module)
+        except TypeError:
+            # Built-in module.
+            continue
+        if path is None:
+            continue
+        sources[path] = _hash_file(path)
+    return sources
+
+
+def _check_sources(sources):
+    for path, digest in six.iteritems(sources):
+        try:
+            if _hash_file(path) != digest:
+                return False
+        except (IOError, OSError):
+            return False
+    return True
+
+
+def _hash_file(path):
+    with open(path, 'rb') as source:
+        return hashlib.sha1(source.read()).hexdigest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m wiring.manifest',
+        description="Manage Wiring dependency manifests."
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    build_parser = subparsers.add_parser(
+        'build',
+        help="Build a manifest for a module class."
+    )
+    build_parser.add_argument(
+        'module',
+        help="Path to the module class, e.g. package.module:ModuleClass."
+    )
+    build_parser.add_argument(
+        '-o', '--output',
+        default='wiring.manifest',
+        help="Path of the manifest file to write (default: %(default)s)."
+    )
+    arguments = parser.parse_args(argv)
+    if arguments.command != 'build':
+        parser.print_usage()
+        return 2
+    try:
+        build_manifest(arguments.module, arguments.output)
+    except ManifestError as error:
+        sys.stderr.write("{}\n".format(error))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
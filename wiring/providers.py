@@ -46,8 +46,38 @@ class ProviderBase(object):
         self.scope = None
 
 
+class IntrospectingProviderBase(ProviderBase):
+    """
+    A base for providers that find their :term:`dependencies <dependency>` by
+    inspecting a wrapped callable with
+    :py:func:`wiring.dependency.get_dependencies`. The inspection is deferred
+    until :py:attr:`dependencies` are first needed, usually when the provider
+    is first used by an :term:`object graph`, so registering providers that
+    are never used costs almost nothing.
+    """
+
+    def __init__(self, introspected):
+        super(IntrospectingProviderBase, self).__init__()
+        # Callable to inspect for dependencies.
+        self._introspected = introspected
+        self._dependencies = None
+
+    @property
+    def dependencies(self):
+        """
+        A dictionary of provider dependencies, computed on first access.
+        """
+        if self._dependencies is None:
+            self._dependencies = get_dependencies(self._introspected)
+        return self._dependencies
+
+    @dependencies.setter
+    def dependencies(self, dependencies):
+        self._dependencies = dependencies
+
+
 @interface.implements(IProvider)
-class FactoryProvider(ProviderBase):
+class FactoryProvider(IntrospectingProviderBase):
     """
     A :term:`provider` that wraps a :py:attr:`factory` callable and when called
     passes required dependencies to it and returns its result.
@@ -67,8 +97,7 @@ class FactoryProvider(ProviderBase):
     """
 
     def __init__(self, factory, scope=None):
-        super(FactoryProvider, self).__init__()
-        self.dependencies = get_dependencies(factory)
+        super(FactoryProvider, self).__init__(factory)
         self.factory = factory
         """A callable that returns an object to be provided."""
         self.scope = scope
@@ -78,7 +107,7 @@ class FactoryProvider(ProviderBase):
 
 
 @interface.implements(IProvider)
-class FunctionProvider(ProviderBase):
+class FunctionProvider(IntrospectingProviderBase):
     """
     A :term:`provider` that wraps a :py:attr:`function` to provide a version of
     it with automatically injected dependencies, as defined in
@@ -102,8 +131,7 @@ class FunctionProvider(ProviderBase):
     """
 
     def __init__(self, function, scope=None):
-        super(FunctionProvider, self).__init__()
-        self.dependencies = get_dependencies(function)
+        super(FunctionProvider, self).__init__(function)
         self.function = function
         """Wrapped function object."""
         self.scope = scope
@@ -32,9 +32,12 @@ def scan_to_graph(python_modules, graph, ignore=tuple()):
 
     `ignore` argument is passed through to :py:func:`scan`.
     """
+    providers = {}
+
     def callback(specification, provider):
-        graph.register_provider(specification, provider)
+        providers[specification] = provider
     scan(python_modules, callback, ignore=ignore)
+    graph.register_providers(providers)
 
 
 def scan(python_modules, callback, ignore=tuple()):
@@ -1,5 +1,6 @@
 import os
 import threading
+import weakref
 
 from wiring import interface
 
@@ -15,6 +16,12 @@ __all__ = (
 class IScope(interface.Interface):
     """
     Interface defining a :term:`scope` object.
+
+    Scopes can also support removing a cached instance for given
+    :term:`specification` with ``del scope[specification]``, raising
+    `KeyError` if there is none, as all built-in scopes do. It's optional, and
+    :py:meth:`wiring.graph.Graph.invalidate` leaves scopes without it as they
+    are.
     """
 
     def __getitem__(specification):
@@ -57,6 +64,16 @@ class SingletonScope(object):
     def __contains__(self, specification):
         return (specification in self._cache)
 
+    def __delitem__(self, specification):
+        del self._cache[specification]
+
+    def clear(self):
+        """
+        Removes all cached instances and returns a list of them.
+        """
+        cache, self._cache = self._cache, {}
+        return list(cache.values())
+
 
 @interface.implements(IScope)
 class ProcessScope(object):
@@ -81,6 +98,19 @@ class ProcessScope(object):
         self._validate()
         return (specification in self._cache)
 
+    def __delitem__(self, specification):
+        self._validate()
+        del self._cache[specification]
+
+    def clear(self):
+        """
+        Removes all instances cached in this process and returns a list of
+        them.
+        """
+        self._validate()
+        cache, self._cache = self._cache, {}
+        return list(cache.values())
+
     def _validate(self):
         current_pid = os.getpid()
         if self._pid != current_pid:  # pragma: no cover
@@ -92,10 +122,17 @@ class ProcessScope(object):
 class ThreadScope(object):
     """
     :term:`Scope` where provided instances are cached per-thread.
+
+    Removing an instance from this scope removes instances cached for the
+    :term:`specification` in all threads.
     """
 
     def __init__(self):
         self._local = threading.local()
+        # Caches of all living threads, so they can be modified from any of
+        # them. Keyed by their identifiers.
+        self._caches = weakref.WeakValueDictionary()
+        self._caches_lock = threading.Lock()
 
     def __getitem__(self, specification):
         self._validate()
@@ -109,6 +146,42 @@ class ThreadScope(object):
         self._validate()
         return (specification in self._local.cache)
 
+    def __delitem__(self, specification):
+        with self._caches_lock:
+            caches = list(self._caches.values())
+        found = False
+        for cache in caches:
+            try:
+                del cache[specification]
+                found = True
+            except KeyError:
+                pass
+        if not found:
+            raise KeyError(specification)
+
+    def clear(self):
+        """
+        Removes instances cached in all threads and returns a list of them.
+        """
+        with self._caches_lock:
+            caches = list(self._caches.values())
+        instances = []
+        for cache in caches:
+            while True:
+                try:
+                    instances.append(cache.popitem()[1])
+                except KeyError:
+                    break
+        return instances
+
     def _validate(self):
         if not hasattr(self._local, 'cache'):
-            self._local.cache = {}
+            cache = _ThreadCache()
+            with self._caches_lock:
+                self._caches[id(cache)] = cache
+            self._local.cache = cache
+
+
+class _ThreadCache(dict):
+    # Plain dictionaries cannot be weakly referenced.
+    __slots__ = ('__weakref__',)